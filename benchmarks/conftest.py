@@ -0,0 +1,104 @@
+import json
+import time
+
+import pytest
+
+from matchbook_api import Client, ReplayTransport
+
+
+def price(side, odds, amount):
+    return {'side': side, 'odds': odds, 'decimal-odds': odds,
+            'available-amount': amount, 'currency': 'GBP',
+            'exchange-type': 'back-lay', 'odds-type': 'DECIMAL'}
+
+
+def runner(runner_id, market_id, event_id):
+    return {'id': runner_id, 'market-id': market_id, 'event-id': event_id,
+            'name': f"Runner {runner_id}", 'status': 'open',
+            'withdrawn': False, 'volume': 1000.0,
+            'prices': [price(side, 2.0 + i / 10, 100.0 + i)
+                       for side in ('back', 'lay') for i in range(3)]}
+
+
+def market(market_id, event_id, runners=3):
+    return {'id': market_id, 'event-id': event_id, 'name': 'Match Odds',
+            'status': 'open', 'market-type': 'one_x_two', 'volume': 5000.0,
+            'runners': [runner(market_id * 10 + i, market_id, event_id)
+                        for i in range(runners)]}
+
+
+def event(event_id, markets=5):
+    return {'id': event_id, 'name': f"Event {event_id}", 'sport-id': 15,
+            'status': 'open', 'start': '2026-10-18T12:00:00.000Z',
+            'markets': [market(event_id * 10 + i, event_id)
+                        for i in range(markets)]}
+
+
+def events_page(offset, per_page, total):
+    return {'offset': offset, 'per-page': per_page, 'total': total,
+            'events': [event(i) for i in range(offset,
+                                               min(offset + per_page, total))]}
+
+
+def write_recording(path, records):
+    with open(path, "w") as f:
+        for method, url, data in records:
+            f.write(json.dumps({
+                't': 0.0, 'method': method, 'url': url, 'body': None,
+                'status': 200, 'headers': {},
+                'response': json.dumps(data),
+            }) + "\n")
+    return str(path)
+
+
+class DelayedTransport(ReplayTransport):
+    def __init__(self, path, latency):
+        super().__init__(path)
+        self.latency = latency
+
+    def request(self, method, url, **kwargs):
+        time.sleep(self.latency)
+        return super().request(method, url, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def large_events_payload():
+    return json.dumps(events_page(0, 200, 200)).encode()
+
+
+@pytest.fixture(scope="session")
+def recording(tmp_path_factory):
+    client = Client(log=False)
+    records = []
+    per_page, total = 50, 500
+    for offset in range(0, total, per_page):
+        url = client.get_events.template.url({
+            'offset': offset, 'per_page': per_page,
+            'states': "open,suspended,closed,graded",
+            'exchange_type': "back-lay", 'odds_type': "DECIMAL",
+            'include_prices': True, 'price_depth': 3,
+            'price_mode': "expanded", 'include_event_participants': False,
+            'exclude_mirrored_prices': False, 'kwargs': {}})
+        records.append(("GET", url, events_page(offset, per_page, total)))
+    for runner_id in range(100):
+        url = client.get_runner.template.url({
+            'event_id': 1, 'market_id': 2, 'runner_id': runner_id,
+            'include_prices': False, 'price_depth': 3,
+            'price_mode': "expanded", 'exchange_type': "back-lay",
+            'odds_type': "DECIMAL", 'exclude_mirrored_prices': False,
+            'kwargs': {}})
+        records.append(("GET", url, runner(runner_id, 2, 1)))
+    path = tmp_path_factory.mktemp("replay") / "recording.jsonl"
+    return write_recording(path, records)
+
+
+@pytest.fixture
+def replay_client(recording):
+    return Client(log=False, middleware=[], relogin=False,
+                  transport=ReplayTransport(recording))
+
+
+@pytest.fixture
+def delayed_client(recording):
+    return Client(log=False, middleware=[], relogin=False,
+                  transport=DelayedTransport(recording, latency=0.005))
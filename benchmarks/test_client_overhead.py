@@ -0,0 +1,54 @@
+import pytest
+
+from matchbook_api import Event
+from matchbook_api.utils import decode_body, json_loads
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_get_runner_overhead(benchmark, replay_client):
+    benchmark(replay_client.get_runner, 1, 2, 3)
+
+
+def test_get_events_with_prices(benchmark, replay_client):
+    benchmark(replay_client.get_events, per_page=50, include_prices=True)
+
+
+def test_decode_large_events_payload(benchmark, large_events_payload):
+    benchmark(decode_body, large_events_payload)
+
+
+def test_decode_large_events_payload_stdlib(benchmark, large_events_payload):
+    import json
+
+    benchmark(json.loads, large_events_payload)
+
+
+def test_build_event_models(benchmark, large_events_payload):
+    events = json_loads(large_events_payload)['events']
+    benchmark(lambda: [Event(event) for event in events])
+
+
+def test_event_model_full_access(benchmark, large_events_payload):
+    events = json_loads(large_events_payload)['events']
+
+    def walk():
+        return sum(price.available_amount
+                   for event in map(Event, events)
+                   for market in event.markets
+                   for runner in market.runners
+                   for price in runner.prices)
+
+    benchmark(walk)
+
+
+def test_scan_card_for_arbitrage(benchmark, large_events_payload):
+    from matchbook_api import MarketArrays
+
+    events = json_loads(large_events_payload)['events']
+
+    def scan():
+        arrays = MarketArrays.from_events(events)
+        return arrays.book_percentage(), arrays.arbitrage()
+
+    benchmark(scan)
@@ -0,0 +1,27 @@
+import pytest
+
+from matchbook_api import Client
+from matchbook_api.utils import add_kwargs_to_url, create_kwarg_dict
+
+pytest.importorskip("pytest_benchmark")
+
+EVENT_PARAMS = {
+    'offset': 0, 'per_page': 20, 'states': "open,suspended",
+    'exchange_type': "back-lay", 'odds_type': "DECIMAL",
+    'include_prices': True, 'price_depth': 3, 'price_mode': "expanded",
+    'include_event_participants': False, 'exclude_mirrored_prices': False,
+}
+
+
+def test_add_kwargs_to_url(benchmark):
+    benchmark(add_kwargs_to_url, "edge/rest/events?", **EVENT_PARAMS)
+
+
+def test_create_kwarg_dict(benchmark):
+    benchmark(create_kwarg_dict, odds=2.5, stake=10.0, keep_in_play=True)
+
+
+def test_request_template(benchmark):
+    template = Client.get_events.template
+    params = EVENT_PARAMS | {'kwargs': {}}
+    benchmark(template.url, params)
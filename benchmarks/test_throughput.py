@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from matchbook_api import AsyncClient, FakeServer
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_pagination_throughput(benchmark, replay_client):
+    def consume():
+        return sum(1 for _ in replay_client.iter_events(
+            per_page=50, include_prices=True))
+
+    assert benchmark(consume) == 500
+
+
+@pytest.mark.parametrize("max_workers", [1, 4, 16])
+def test_threaded_fan_out(benchmark, delayed_client, max_workers):
+    args = [(1, 2, runner_id) for runner_id in range(100)]
+    benchmark.pedantic(delayed_client.map,
+                       args=(delayed_client.get_runner, args),
+                       kwargs={'max_workers': max_workers}, rounds=3)
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 8, 32])
+def test_async_fan_out(benchmark, recording, max_in_flight):
+    async def fan_out(url):
+        async with AsyncClient(log=False,
+                               max_in_flight=max_in_flight) as client:
+            client.session.url = url
+            await asyncio.gather(*(client.get_runner(1, 2, runner_id)
+                                   for runner_id in range(100)))
+
+    with FakeServer(recording) as server:
+        benchmark.pedantic(lambda: asyncio.run(fan_out(server.url)),
+                           rounds=3)
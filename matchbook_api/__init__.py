@@ -1 +1,57 @@
-from .client import Client
+import importlib
+
+
+_EXPORTS = {
+    'Client': 'client',
+    'AsyncClient': 'async_client',
+    'AsyncSession': 'async_client',
+    'MarketBook': 'orderbook',
+    'RunnerBook': 'orderbook',
+    'MarketStreamer': 'streamer',
+    'DiskCache': 'cache',
+    'MemoryCache': 'cache',
+    'ResponseCache': 'cache',
+    'RateLimiter': 'ratelimit',
+    'AsyncReloginMiddleware': 'middleware',
+    'AsyncRetryMiddleware': 'middleware',
+    'ReloginMiddleware': 'middleware',
+    'RetryMiddleware': 'middleware',
+    'Bet': 'models',
+    'Event': 'models',
+    'Market': 'models',
+    'Offer': 'models',
+    'Position': 'models',
+    'Price': 'models',
+    'Runner': 'models',
+    'HTTPXTransport': 'transport',
+    'RequestsTransport': 'transport',
+    'HeartbeatKeeper': 'heartbeat',
+    'MarketLedger': 'positions',
+    'PositionLedger': 'positions',
+    'ReportExporter': 'export',
+    'FakeServer': 'replay',
+    'RecordingTransport': 'replay',
+    'ReplayTransport': 'replay',
+    'Metrics': 'metrics',
+    'Catalogue': 'catalogue',
+    'ClientPool': 'pool',
+    'QuoteManager': 'quotes',
+    'SingleFlight': 'coalesce',
+    'TokenCache': 'tokens',
+    'MarketArrays': 'analytics',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
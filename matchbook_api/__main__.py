@@ -0,0 +1,91 @@
+import argparse
+import json
+import sys
+from http.client import HTTPException
+
+import requests
+
+from .client import Client
+from .tokens import DEFAULT_TOKEN_PATH, TokenCache
+
+
+COMMANDS = {
+    'balance': lambda client, args: client.get_balance(),
+    'account': lambda client, args: client.get_account(),
+    'sports': lambda client, args: client.get_sports(
+        offset=args.offset, per_page=args.per_page),
+    'events': lambda client, args: client.get_events(
+        offset=args.offset, per_page=args.per_page, states=args.states,
+        **({'sport_ids': args.sport_ids} if args.sport_ids else {})),
+    'markets': lambda client, args: client.get_markets(
+        args.event_id, offset=args.offset, per_page=args.per_page,
+        states=args.states),
+    'runners': lambda client, args: client.get_runners(
+        args.event_id, args.market_id, states=args.states),
+    'offers': lambda client, args: client.get_current_offers(
+        offset=args.offset, per_page=args.per_page),
+    'bets': lambda client, args: client.get_current_bets(
+        offset=args.offset, per_page=args.per_page),
+    'positions': lambda client, args: client.get_positions(
+        offset=args.offset, per_page=args.per_page),
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m matchbook_api",
+        description="Query the Matchbook API and print the JSON response.")
+    parser.add_argument("--username", help="defaults to $matchbook_username")
+    parser.add_argument("--password", help="defaults to $matchbook_password")
+    parser.add_argument("--token-cache", default=DEFAULT_TOKEN_PATH,
+                        help="file used to reuse session tokens between runs")
+    parser.add_argument("--no-token-cache", action="store_true")
+    parser.add_argument("--url", help="override the API base URL")
+    parser.add_argument("--indent", type=int, default=2)
+
+    paging = argparse.ArgumentParser(add_help=False)
+    paging.add_argument("--offset", type=int, default=0)
+    paging.add_argument("--per-page", type=int, default=20)
+    states = argparse.ArgumentParser(add_help=False)
+    states.add_argument("--states", default="open,suspended")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("balance")
+    commands.add_parser("account")
+    commands.add_parser("sports", parents=[paging])
+    events = commands.add_parser("events", parents=[paging, states])
+    events.add_argument("--sport-ids", help="comma separated sport ids")
+    markets = commands.add_parser("markets", parents=[paging, states])
+    markets.add_argument("event_id", type=int)
+    runners = commands.add_parser("runners", parents=[states])
+    runners.add_argument("event_id", type=int)
+    runners.add_argument("market_id", type=int)
+    commands.add_parser("offers", parents=[paging])
+    commands.add_parser("bets", parents=[paging])
+    commands.add_parser("positions", parents=[paging])
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    token_cache = (None if args.no_token_cache
+                   else TokenCache(args.token_cache))
+    client = Client(args.username, args.password, log=False,
+                    token_cache=token_cache)
+    if args.url is not None:
+        client.session.url = args.url
+    try:
+        data = client.login()
+        if not isinstance(data, HTTPException):
+            data = COMMANDS[args.command](client, args)
+    except requests.RequestException as e:
+        data = e
+    if isinstance(data, (HTTPException, requests.RequestException)):
+        print(data, file=sys.stderr)
+        return 1
+    print(json.dumps(data, indent=args.indent))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
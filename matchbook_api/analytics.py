@@ -0,0 +1,181 @@
+from typing import List
+
+import numpy as np
+
+
+ODDS_TYPES = ('DECIMAL', 'US', 'HK', 'MALAY', 'INDO', '%')
+
+
+def to_decimal(odds, odds_type: str = "DECIMAL"):
+    odds = np.asarray(odds, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if odds_type == 'DECIMAL':
+            return odds
+        if odds_type == 'US':
+            return np.where(odds > 0, 1 + odds / 100, 1 - 100 / odds)
+        if odds_type == 'HK':
+            return odds + 1
+        if odds_type in ('MALAY', 'INDO'):
+            return np.where(odds > 0, 1 + odds, 1 - 1 / odds)
+        if odds_type == '%':
+            return 100 / odds
+    raise ValueError(f"Unknown odds type {odds_type!r}.")
+
+
+def from_decimal(odds, odds_type: str = "DECIMAL"):
+    odds = np.asarray(odds, dtype=float)
+    profit = odds - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if odds_type == 'DECIMAL':
+            return odds
+        if odds_type == 'US':
+            return np.where(odds >= 2, profit * 100, -100 / profit)
+        if odds_type == 'HK':
+            return profit
+        if odds_type == 'MALAY':
+            return np.where(odds <= 2, profit, -1 / profit)
+        if odds_type == 'INDO':
+            return np.where(odds >= 2, profit, -1 / profit)
+        if odds_type == '%':
+            return 100 / odds
+    raise ValueError(f"Unknown odds type {odds_type!r}.")
+
+
+def convert_odds(odds, from_type: str, to_type: str):
+    return from_decimal(to_decimal(odds, from_type), to_type)
+
+
+class MarketArrays:
+    def __init__(self, market_ids, event_ids, offsets, runner_ids,
+                 back_odds, back_amounts, lay_odds, lay_amounts):
+        self.market_ids = market_ids
+        self.event_ids = event_ids
+        self.offsets = offsets
+        self.runner_ids = runner_ids
+        self.back_odds = back_odds
+        self.back_amounts = back_amounts
+        self.lay_odds = lay_odds
+        self.lay_amounts = lay_amounts
+
+    @classmethod
+    def from_markets(cls, markets: List[dict], depth: int = 3,
+                     odds_type: str = "DECIMAL"):
+        market_ids, event_ids, offsets, runner_ids = [], [], [0], []
+        rows, backs, odds, amounts, native = [], [], [], [], []
+        for market in markets:
+            runners = market.get('runners') or []
+            if not runners:
+                continue
+            market_ids.append(market['id'])
+            event_ids.append(market.get('event-id'))
+            for runner in runners:
+                row = len(runner_ids)
+                runner_ids.append(runner['id'])
+                for price in runner.get('prices') or []:
+                    rows.append(row)
+                    backs.append(price['side'] == 'back')
+                    decimal = price.get('decimal-odds')
+                    native.append(decimal is None)
+                    odds.append(price['odds'] if decimal is None
+                                else decimal)
+                    amounts.append(price['available-amount'])
+            offsets.append(len(runner_ids))
+
+        n = len(runner_ids)
+        rows = np.array(rows, dtype=np.intp)
+        backs = np.array(backs, dtype=bool)
+        odds = np.array(odds, dtype=float)
+        amounts = np.array(amounts, dtype=float)
+        if odds_type != 'DECIMAL':
+            native = np.array(native, dtype=bool)
+            odds[native] = to_decimal(odds[native], odds_type)
+
+        order = np.lexsort((np.where(backs, -odds, odds), backs, rows))
+        rows, backs = rows[order], backs[order]
+        odds, amounts = odds[order], amounts[order]
+        group = rows * 2 + backs
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        rank = np.arange(len(group)) - np.repeat(
+            starts, np.diff(np.r_[starts, len(group)]))
+        keep = rank < depth
+
+        arrays = []
+        for side in (True, False):
+            mask = keep & (backs == side)
+            side_odds = np.full((n, depth), np.nan)
+            side_amounts = np.zeros((n, depth))
+            side_odds[rows[mask], rank[mask]] = odds[mask]
+            side_amounts[rows[mask], rank[mask]] = amounts[mask]
+            arrays += [side_odds, side_amounts]
+        return cls(np.array(market_ids), np.array(event_ids),
+                   np.array(offsets, dtype=np.intp), np.array(runner_ids),
+                   *arrays)
+
+    @classmethod
+    def from_events(cls, events: List[dict], depth: int = 3,
+                    odds_type: str = "DECIMAL"):
+        markets = []
+        for event in events:
+            for market in event.get('markets') or []:
+                if market.get('event-id') is None:
+                    market = dict(market, **{'event-id': event['id']})
+                markets.append(market)
+        return cls.from_markets(markets, depth, odds_type)
+
+    def __len__(self):
+        return len(self.market_ids)
+
+    @property
+    def runner_market(self):
+        return np.repeat(np.arange(len(self.market_ids)),
+                         np.diff(self.offsets))
+
+    @property
+    def best_back(self):
+        return self.back_odds[:, 0]
+
+    @property
+    def best_lay(self):
+        return self.lay_odds[:, 0]
+
+    def odds(self, side: str = "back", odds_type: str = "DECIMAL"):
+        best = self.best_back if side == 'back' else self.best_lay
+        return from_decimal(best, odds_type)
+
+    def implied_probability(self, side: str = "back"):
+        return 1 / (self.best_back if side == 'back' else self.best_lay)
+
+    def spread(self):
+        return self.best_lay - self.best_back
+
+    def weighted_odds(self, side: str = "back"):
+        odds, amounts = ((self.back_odds, self.back_amounts)
+                         if side == 'back'
+                         else (self.lay_odds, self.lay_amounts))
+        total = amounts.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.nansum(odds * amounts, axis=1) / total
+
+    def _per_market(self, values):
+        return np.add.reduceat(values, self.offsets[:-1])
+
+    def book_percentage(self, side: str = "back"):
+        return 100 * self._per_market(self.implied_probability(side))
+
+    def fair_odds(self):
+        back = self.implied_probability('back')
+        lay = self.implied_probability('lay')
+        mid = np.where(np.isnan(back), lay,
+                       np.where(np.isnan(lay), back, (back + lay) / 2))
+        total = self._per_market(np.nan_to_num(mid))
+        return total[self.runner_market] / mid
+
+    def arbitrage(self, commission: float = 0.0):
+        back = 1 + (self.best_back - 1) * (1 - commission)
+        lay = 1 + (self.best_lay - 1) / (1 - commission)
+        back_book = self._per_market(1 / back)
+        lay_book = self._per_market(1 / lay)
+        return {
+            'back': self.market_ids[back_book < 1],
+            'lay': self.market_ids[lay_book > 1],
+        }
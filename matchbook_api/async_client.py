@@ -0,0 +1,278 @@
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from functools import partial
+from typing import Awaitable, Iterable, List, Tuple
+
+import aiohttp
+
+from .bulk import merge_offer_results
+from .client import Client
+from .coalesce import SingleFlight
+from .metrics import Metrics
+from .middleware import AsyncReloginMiddleware, AsyncRetryMiddleware
+from .pagination import aiter_records
+from .ratelimit import RateLimiter
+from .utils import (DEFAULT_HEADERS, configure_logging, decode_body,
+                    http_error, normalize_url)
+
+
+async def bounded_gather(aws: Iterable[Awaitable], max_in_flight: int = 10,
+                         return_exceptions: bool = False):
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws),
+                                return_exceptions=return_exceptions)
+
+
+class AsyncResponse:
+    __slots__ = ('status_code', 'headers', 'content')
+
+    def __init__(self, status_code: int, headers, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+
+class TaskContext:
+    _headers = contextvars.ContextVar('matchbook_headers', default=None)
+
+    @property
+    def headers(self):
+        return self._headers.get()
+
+    @headers.setter
+    def headers(self, headers):
+        self._headers.set(headers)
+
+
+class AsyncSession:
+    def __init__(self, log: bool = True, max_in_flight: int = 10,
+                 pool_size: int = 100, rate_limiter: RateLimiter = None,
+                 raw: bool = False, single_flight: SingleFlight = None,
+                 middleware: List = None, metrics: Metrics = None):
+        self.url = "https://api.matchbook.com/"
+        self.rate_limiter = rate_limiter
+        self.single_flight = single_flight
+        self.middleware = list(middleware or [])
+        self.metrics = metrics
+        self.context = TaskContext()
+        self.raw = raw
+        self.max_in_flight = max_in_flight
+        self.pool_size = pool_size
+        self.session = None
+        self._semaphore = None
+        self.log = log
+        if log:
+            self.session_logging_file = "session.log"
+            configure_logging(self.session_logging_file)
+
+    def _get_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self.session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self.session
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def _transmit(self, method, url, kwargs):
+        headers = self.context.headers
+        if headers:
+            kwargs = kwargs | {'headers': kwargs['headers'] | headers}
+        session = self._get_session()
+        async with self._semaphore:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(method, url)
+            start = time.perf_counter()
+            response = None
+            try:
+                async with session.request(method, self.url + url,
+                                           **kwargs) as r:
+                    response = AsyncResponse(r.status, r.headers,
+                                             await r.read())
+            finally:
+                if self.metrics is not None:
+                    self._observe(method, url, kwargs, response, start)
+        if response.status_code == 429 and self.rate_limiter is not None:
+            self.rate_limiter.throttle(method, url)
+        return response
+
+    def _observe(self, method, url, kwargs, response, start):
+        end = time.perf_counter()
+        if response is None:
+            self.metrics.observe(method, url, 0, start, end)
+            return
+        sent = kwargs.get('json')
+        self.metrics.observe(method, url, response.status_code, start, end,
+                             len(json.dumps(sent)) if sent is not None
+                             else 0, len(response.content))
+
+    def _send(self, method, url, **kwargs):
+        call = self._transmit
+        for middleware in reversed(self.middleware):
+            call = partial(middleware, call_next=call)
+        return call(method, url, kwargs)
+
+    async def _fetch(self, method, url, json=None, headers=DEFAULT_HEADERS):
+        r = await self._send(method, url, json=json, headers=headers)
+        return r.status_code, r.content
+
+    async def request(self, method, url, json=None, headers=DEFAULT_HEADERS,
+                      raw=None):
+        if method == "GET" and self.single_flight is not None:
+            key = (id(self), normalize_url(url),
+                   tuple(sorted((self.context.headers or {}).items())))
+            status_code, body = await self.single_flight.do_async(
+                key, lambda: self._fetch(method, url, json, headers),
+                lambda result: result[0] == 200)
+        else:
+            status_code, body = await self._fetch(method, url, json, headers)
+        if status_code != 200:
+            return http_error(status_code, decode_body(body))
+        if self.log:
+            logging.info(f"HTTP {method} request returned 200 (success).")
+        return decode_body(body, self.raw if raw is None else raw)
+
+    async def post(self, url, json, headers=DEFAULT_HEADERS, raw=None):
+        return await self.request("POST", url, json, headers, raw)
+
+    async def delete(self, url, headers=DEFAULT_HEADERS, raw=None):
+        return await self.request("DELETE", url, headers=headers, raw=raw)
+
+    async def get(self, url, headers=DEFAULT_HEADERS, raw=None):
+        return await self.request("GET", url, headers=headers, raw=raw)
+
+    async def put(self, url, json, headers=DEFAULT_HEADERS, raw=None):
+        return await self.request("PUT", url, json, headers, raw)
+
+
+class AsyncClient(Client):
+    def __init__(self, username: str = None, password: str = None,
+                 log: bool = True, max_in_flight: int = 10,
+                 rate_limiter: RateLimiter = None, models: bool = False,
+                 single_flight: SingleFlight = None, middleware: List = None,
+                 relogin: bool = True, metrics: Metrics = None):
+        self.username = username
+        self.password = password
+        self.models = models
+        self.token_cache = None
+        self.login_lock = threading.RLock()
+        if middleware is None:
+            middleware = [AsyncRetryMiddleware(metrics=metrics)]
+        if relogin:
+            middleware = [AsyncReloginMiddleware(self)] + middleware
+        self.session = AsyncSession(log, max_in_flight,
+                                    rate_limiter=rate_limiter,
+                                    single_flight=single_flight,
+                                    middleware=middleware, metrics=metrics)
+        self.session_token = None
+        if log:
+            self.client_logging_file = "client.log"
+            configure_logging(self.client_logging_file)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.session.close()
+
+    async def login(self):
+        url = "bpapi/rest/security/session"
+        payload = {
+            "username": (self.username if self.username is not None
+                         else os.environ.get('matchbook_username')),
+            "password": (self.password if self.password is not None
+                         else os.environ.get('matchbook_password'))
+        }
+        headers = {
+            "content-type": "application/json;charset=UTF-8",
+            "accept": "*/*"
+        }
+
+        data = await self.session.post(url, payload, headers, raw=False)
+        if isinstance(data, Exception):
+            logging.error("Login failed.")
+            return data
+        else:
+            self.session_token = data['session-token']
+            self.user_id = data['user-id']
+            logging.info("Login successful.")
+            return data
+
+    async def logout(self):
+        url = "bpapi/rest/security/session"
+
+        data = await self.session.delete(url, raw=False)
+        if isinstance(data, Exception):
+            logging.error("Logout failed.")
+            return data
+        else:
+            self.session_token = None
+            logging.info("Logout successful.")
+
+    async def validate_session(self):
+        url = "bpapi/rest/security/session"
+        data = await self.session.get(url)
+        if isinstance(data, Exception):
+            logging.info("Session check: not active.")
+            return False
+        else:
+            logging.info("Session check: active.")
+            return True
+
+    def _parse(self, data, model, key: str = None):
+        async def parse():
+            return Client._parse(self, await data, model, key)
+        return parse()
+
+    async def map(self, method, args_list: List, max_workers: int = 10,
+                  **kwargs):
+        return await bounded_gather(
+            (method(*(args if isinstance(args, tuple) else (args,)),
+                    **kwargs) for args in args_list), max_workers)
+
+    def _paginate(self, fetch, key: str, per_page: int, prefetch: bool,
+                  **kwargs):
+        return aiter_records(fetch, key, per_page=per_page, prefetch=prefetch,
+                             **kwargs)
+
+    async def _bulk(self, send, chunks: List[List], max_workers: int):
+        results = await bounded_gather((send(chunk) for chunk in chunks),
+                                       max_workers, return_exceptions=True)
+        return merge_offer_results(chunks, results)
+
+    async def get_events_by_ids(self, event_ids: List[int],
+                                max_in_flight: int = None, **kwargs):
+        results = await bounded_gather(
+            (self.get_event(event_id, **kwargs) for event_id in event_ids),
+            max_in_flight or self.session.max_in_flight)
+        return dict(zip(event_ids, results))
+
+    async def get_markets_for_events(self, event_ids: List[int],
+                                     max_in_flight: int = None, **kwargs):
+        results = await bounded_gather(
+            (self.get_markets(event_id, **kwargs) for event_id in event_ids),
+            max_in_flight or self.session.max_in_flight)
+        return dict(zip(event_ids, results))
+
+    async def get_runners_for_markets(self, market_ids: List[Tuple[int, int]],
+                                      max_in_flight: int = None, **kwargs):
+        results = await bounded_gather(
+            (self.get_runners(event_id, market_id, **kwargs)
+             for event_id, market_id in market_ids),
+            max_in_flight or self.session.max_in_flight)
+        return dict(zip(market_ids, results))
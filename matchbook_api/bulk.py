@@ -0,0 +1,21 @@
+from typing import List
+
+
+MAX_OFFERS_PER_REQUEST = 25
+
+
+def chunked(items: List, size: int):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def merge_offer_results(chunks: List[List], results: List):
+    merged = {'offers': [], 'failed': [], 'errors': []}
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            merged['errors'].append({'offers': chunk, 'error': result})
+            continue
+        for offer in result.get('offers', []):
+            merged['offers'].append(offer)
+            if offer.get('status') == 'failed' or offer.get('errors'):
+                merged['failed'].append(offer)
+    return merged
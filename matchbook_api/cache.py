@@ -0,0 +1,114 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_TTLS = {
+    "edge/rest/lookups/sports": 3600,
+    "edge/rest/navigation": 300,
+    "edge/rest/popular/sports": 300,
+    "bpapi/rest/lookups/countries": 86400,
+    "bpapi/rest/lookups/regions": 86400,
+    "bpapi/rest/lookups/currencies": 86400,
+}
+
+
+class MemoryCache:
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    def __init__(self, path: str = "matchbook_cache.sqlite"):
+        self.path = path
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS responses "
+                               "(key TEXT PRIMARY KEY, entry TEXT)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, key):
+        with self._connect() as connection:
+            row = connection.execute("SELECT entry FROM responses WHERE "
+                                     "key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key, entry):
+        with self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO responses VALUES "
+                               "(?, ?)", (key, json.dumps(entry)))
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM responses")
+
+
+class ResponseCache:
+    def __init__(self, backend=None, ttls: dict = None):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttls = DEFAULT_TTLS | (ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def ttl(self, url: str):
+        path = url.split("?", 1)[0]
+        matches = [prefix for prefix in self.ttls if path.startswith(prefix)]
+        return self.ttls[max(matches, key=len)] if matches else None
+
+    def lookup(self, url: str):
+        entry = self.backend.get(url)
+        if entry is not None and entry['expires'] > time.time():
+            self.hits += 1
+            return entry['body'].encode(), entry
+        return None, entry
+
+    def validators(self, entry):
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last-modified'):
+                headers['If-Modified-Since'] = entry['last-modified']
+        return headers
+
+    def revalidated(self, url: str, entry, ttl: float):
+        self.revalidations += 1
+        entry['expires'] = time.time() + ttl
+        self.backend.set(url, entry)
+        return entry['body'].encode()
+
+    def store(self, url: str, body: bytes, response_headers, ttl: float):
+        self.misses += 1
+        self.backend.set(url, {
+            'body': body.decode(),
+            'expires': time.time() + ttl,
+            'etag': response_headers.get('ETag'),
+            'last-modified': response_headers.get('Last-Modified'),
+        })
+
+    def clear(self):
+        self.backend.clear()
@@ -0,0 +1,189 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY, name TEXT, sport_id INTEGER,
+    category_id INTEGER, start TEXT, status TEXT
+);
+CREATE TABLE IF NOT EXISTS event_tags (
+    event_id INTEGER, tag TEXT, tag_type TEXT,
+    PRIMARY KEY (event_id, tag)
+);
+CREATE TABLE IF NOT EXISTS markets (
+    id INTEGER PRIMARY KEY, event_id INTEGER, name TEXT, status TEXT,
+    market_type TEXT, start TEXT
+);
+CREATE TABLE IF NOT EXISTS runners (
+    id INTEGER PRIMARY KEY, market_id INTEGER, event_id INTEGER, name TEXT,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS market_refreshes (
+    event_id INTEGER PRIMARY KEY, refreshed_at REAL
+);
+CREATE INDEX IF NOT EXISTS events_sport ON events (sport_id, start);
+CREATE INDEX IF NOT EXISTS events_status ON events (status, start);
+CREATE INDEX IF NOT EXISTS event_tags_tag ON event_tags (tag);
+CREATE INDEX IF NOT EXISTS markets_event ON markets (event_id);
+CREATE INDEX IF NOT EXISTS markets_type ON markets (market_type, status);
+CREATE INDEX IF NOT EXISTS runners_market ON runners (market_id);
+"""
+
+
+class Catalogue:
+    def __init__(self, client, path: str = ":memory:",
+                 states: str = "open,suspended", max_workers: int = 8,
+                 market_ttl: float = 300):
+        self.client = client
+        self.states = states
+        self.max_workers = max_workers
+        self.market_ttl = market_ttl
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _store_event(self, event: dict):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?)",
+            (event['id'], event.get('name'), event.get('sport-id'),
+             event.get('category-id'), event.get('start'),
+             event.get('status')))
+        self.connection.execute("DELETE FROM event_tags WHERE event_id = ?",
+                                (event['id'],))
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO event_tags VALUES (?, ?, ?)",
+            [(event['id'], tag.get('url-name') or tag.get('name'),
+              tag.get('type')) for tag in event.get('meta-tags') or []])
+
+    def _store_markets(self, event_id: int, markets: list, now: float):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO market_refreshes VALUES (?, ?)",
+            (event_id, now))
+        self.connection.execute("DELETE FROM runners WHERE event_id = ?",
+                                (event_id,))
+        self.connection.execute("DELETE FROM markets WHERE event_id = ?",
+                                (event_id,))
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO markets VALUES (?, ?, ?, ?, ?, ?)",
+            [(market['id'], event_id, market.get('name'),
+              market.get('status'), market.get('market-type'),
+              market.get('start')) for market in markets])
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO runners VALUES (?, ?, ?, ?, ?)",
+            [(runner['id'], market['id'], event_id, runner.get('name'),
+              runner.get('status'))
+             for market in markets
+             for runner in market.get('runners') or []])
+
+    def _known(self):
+        markets = defaultdict(list)
+        for row in self.connection.execute(
+                "SELECT id, event_id, status FROM markets"):
+            markets[row['event_id']].append((row['id'], row['status']))
+        refreshed = dict(self.connection.execute(
+            "SELECT event_id, refreshed_at FROM market_refreshes"))
+        return {row['id']: (row['status'], row['start'],
+                            sorted(markets[row['id']]),
+                            refreshed.get(row['id'], 0.0))
+                for row in self.connection.execute(
+                    "SELECT id, status, start FROM events")}
+
+    def _changed(self, event: dict, known, now: float):
+        if event['id'] not in known:
+            return True
+        status, start, markets, refreshed = known[event['id']]
+        if (status, start) != (event.get('status'), event.get('start')):
+            return True
+        if event.get('markets'):
+            return markets != sorted((market['id'], market.get('status'))
+                                     for market in event['markets'])
+        return now - refreshed >= self.market_ttl
+
+    def _fetch_markets(self, event_id: int):
+        return list(self.client.iter_markets(event_id, states=self.states))
+
+    def refresh(self):
+        with self._lock:
+            known = self._known()
+        events = list(self.client.iter_events(states=self.states))
+        now = time.time()
+        changed = [event for event in events
+                   if self._changed(event, known, now)]
+        missing = [event['id'] for event in changed
+                   if not event.get('markets')]
+        markets = dict(zip(missing, self.client.map(
+            self._fetch_markets, missing, max_workers=self.max_workers)))
+        gone = ({event_id for event_id, (status, *_) in known.items()
+                 if status != 'closed'}
+                - {event['id'] for event in events})
+        with self._lock, self.connection:
+            for event in changed:
+                self._store_event(event)
+                self._store_markets(event['id'],
+                                    markets.get(event['id'])
+                                    or event.get('markets') or [], now)
+            for event_id in gone:
+                self.connection.execute(
+                    "UPDATE events SET status = 'closed' WHERE id = ?",
+                    (event_id,))
+                self.connection.execute(
+                    "UPDATE markets SET status = 'closed' WHERE "
+                    "event_id = ?", (event_id,))
+        logging.info(f"Catalogue refreshed: {len(changed)} events changed, "
+                     f"{len(gone)} closed.")
+        return {'changed': len(changed), 'closed': len(gone)}
+
+    def _query(self, sql: str, params: list):
+        with self._lock:
+            return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def event(self, event_id: int):
+        rows = self._query("SELECT * FROM events WHERE id = ?", [event_id])
+        return rows[0] if rows else None
+
+    def events(self, sport_id: int = None, tag: str = None,
+               status: str = None, start_after: str = None,
+               start_before: str = None):
+        sql = "SELECT DISTINCT e.* FROM events e"
+        where, params = [], []
+        if tag is not None:
+            sql += " JOIN event_tags t ON t.event_id = e.id"
+            where.append("t.tag = ?")
+            params.append(tag)
+        for clause, value in (("e.sport_id = ?", sport_id),
+                              ("e.status = ?", status),
+                              ("e.start >= ?", start_after),
+                              ("e.start < ?", start_before)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._query(sql + " ORDER BY e.start", params)
+
+    def markets(self, event_id: int = None, sport_id: int = None,
+                status: str = None, market_type: str = None):
+        sql = "SELECT m.* FROM markets m JOIN events e ON e.id = m.event_id"
+        where, params = [], []
+        for clause, value in (("m.event_id = ?", event_id),
+                              ("e.sport_id = ?", sport_id),
+                              ("m.status = ?", status),
+                              ("m.market_type = ?", market_type)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._query(sql + " ORDER BY e.start, m.id", params)
+
+    def runners(self, market_id: int):
+        return self._query("SELECT * FROM runners WHERE market_id = ? "
+                           "ORDER BY id", [market_id])
+
+    def close(self):
+        self.connection.close()
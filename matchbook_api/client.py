@@ -1,55 +1,113 @@
 import logging
 from typing import List
 import os
-
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .bulk import MAX_OFFERS_PER_REQUEST, chunked, merge_offer_results
+from .cache import ResponseCache
+from .coalesce import SingleFlight
+from .endpoints import endpoint
+from .metrics import Metrics
+from .middleware import ReloginMiddleware, RetryMiddleware
+from .models import Bet, Event, Market, Offer, Position, Price, Runner
+from .pagination import iter_records
+from .ratelimit import RateLimiter
 from .session import Session
-from .utils import add_kwargs_to_url, create_kwarg_dict
+from .tokens import TokenCache
+from .utils import add_kwargs_to_url, configure_logging, create_kwarg_dict
 
 
 class Client:
     def __init__(self, username: str = None, password: str = None,
-                 log: bool = True):
+                 log: bool = True, cache: ResponseCache = None,
+                 rate_limiter: RateLimiter = None, middleware: List = None,
+                 relogin: bool = True, models: bool = False,
+                 raw: bool = False, transport=None,
+                 metrics: Metrics = None,
+                 single_flight: SingleFlight = None,
+                 token_cache: TokenCache = None):
         self.username = username
         self.password = password
-        self.session = Session(log)
+        self.models = models
+        self.token_cache = token_cache
+        self.login_lock = threading.RLock()
+        self._login_generation = 0
+        self._login_data = None
+        if middleware is None:
+            middleware = [RetryMiddleware(metrics=metrics)]
+        if relogin:
+            middleware = [ReloginMiddleware(self)] + middleware
+        self.session = Session(log, cache, rate_limiter, middleware, raw,
+                               transport, metrics, single_flight)
         self.session_token = None
         if log:
             self.client_logging_file = "client.log"
-            logging.basicConfig(filename=self.client_logging_file,
-                                level=logging.INFO)
+            configure_logging(self.client_logging_file)
     
-    def login(self):
-        url = "bpapi/rest/security/session"
-        payload = {
-            "username": (self.username if self.username is not None
-                         else os.environ.get('matchbook_username')),
-            "password": (self.password if self.password is not None
-                         else os.environ.get('matchbook_password'))
-        }
-        headers = {
-            "content-type": "application/json;charset=UTF-8",
-            "accept": "*/*"
-        }
+    def _username(self):
+        return (self.username if self.username is not None
+                else os.environ.get('matchbook_username'))
 
-        data = self.session.post(url, payload, headers)
-        if isinstance(data, Exception):
-            logging.error("Login failed.")
-            return data
-        else:
-            self.session_token = data['session-token']
-            self.user_id = data['user-id']
-            logging.info("Login successful.")
-            return data
+    def _logged_in(self, data):
+        self._login_data = data
+        self._login_generation += 1
+        return data
+
+    def login(self):
+        generation = self._login_generation
+        with self.login_lock:
+            if (generation != self._login_generation
+                    and self.session_token is not None):
+                return self._login_data
+            if self.token_cache is not None and self.session_token is None:
+                cached = self.token_cache.load(self._username())
+                if cached is not None:
+                    self.session_token = cached['session-token']
+                    self.user_id = cached['user-id']
+                    host = urllib.parse.urlsplit(self.session.url).hostname
+                    self.session.session.cookies.set(
+                        'session-token', self.session_token, domain=host,
+                        path="/")
+                    logging.info("Login restored from token cache.")
+                    return self._logged_in(cached)
+            url = "bpapi/rest/security/session"
+            payload = {
+                "username": self._username(),
+                "password": (self.password if self.password is not None
+                             else os.environ.get('matchbook_password'))
+            }
+            headers = {
+                "content-type": "application/json;charset=UTF-8",
+                "accept": "*/*"
+            }
+
+            data = self.session.post(url, payload, headers, raw=False)
+            if isinstance(data, Exception):
+                logging.error("Login failed.")
+                return data
+            else:
+                self.session_token = data['session-token']
+                self.user_id = data['user-id']
+                if self.token_cache is not None:
+                    self.token_cache.save(self._username(),
+                                          self.session_token, self.user_id)
+                logging.info("Login successful.")
+                return self._logged_in(data)
 
     def logout(self):
         url = "bpapi/rest/security/session"
         
-        data = self.session.delete(url)
+        data = self.session.delete(url, raw=False)
         if isinstance(data, Exception):
             logging.error("Logout failed.")
             return data
         else:
             self.session_token = None
+            if self.token_cache is not None:
+                self.token_cache.discard(self._username())
             logging.info("Logout successful.")
     
     def validate_session(self):
@@ -62,6 +120,36 @@ class Client:
             logging.info("Session check: active.")
             return True
 
+    def _parse(self, data, model, key: str = None):
+        if not self.models or not isinstance(data, dict):
+            return data
+        if key is None:
+            return model(data)
+        data[key] = [model(item) for item in data.get(key, [])]
+        return data
+
+    @contextmanager
+    def request_context(self, **headers):
+        previous = getattr(self.session.context, 'headers', None)
+        self.session.context.headers = (previous or {}) | headers
+        try:
+            yield
+        finally:
+            self.session.context.headers = previous
+
+    def map(self, method, args_list: List, max_workers: int = 10,
+            **kwargs):
+        headers = getattr(self.session.context, 'headers', None) or {}
+
+        def call(args):
+            if not isinstance(args, tuple):
+                args = (args,)
+            with self.request_context(**headers):
+                return method(*args, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(call, args_list))
+
     def get_account(self):
         url = "edge/rest/account"
 
@@ -74,25 +162,22 @@ class Client:
         data = self.session.get(url)
         return data
 
+    @endpoint("edge/rest/lookups/sports")
     def get_sports(self, offset: int = 0, per_page: int = 20,
                    order: str = "name asc"):
-        params = locals()
-        url = "edge/rest/lookups/sports?"
-        del params['self']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_sports.template.url(locals())
 
         data = self.session.get(url)
         return data
 
+    @endpoint("edge/rest/navigation")
     def get_navigation(self, offset: int = 0, per_page: int = 20):
-        params = locals()
-        url = "edge/rest/navigation?"
-        del params['self']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_navigation.template.url(locals())
 
         data = self.session.get(url)
         return data
 
+    @endpoint("edge/rest/events")
     def get_events(self, offset: int = 0, per_page: int = 20,
                    states: str = "open,suspended,closed,graded",
                    exchange_type: str = "back-lay", odds_type: str = "DECIMAL",
@@ -100,63 +185,46 @@ class Client:
                    price_mode: str = "expanded",
                    include_event_participants: bool = False,
                    exclude_mirrored_prices: bool = False, **kwargs):
-        params = locals() | kwargs
-        url = "edge/rest/events?"
-        del params['self']
-        del params['kwargs']
-        url = add_kwargs_to_url(url, **params)
-        print(url)
+        url = Client.get_events.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Event, 'events')
 
+    @endpoint("edge/rest/events/{event_id}")
     def get_event(self, event_id: int, exchange_type: str = "back-lay",
                   odds_type: str = "DECIMAL", include_prices: bool = False,
                   price_depth: int = 3, price_mode: str = "expanded",
                   include_event_participants: bool = False,
                   exclude_mirrored_prices: bool = False, **kwargs):
-        params = locals() | kwargs
-        url = f"edge/rest/events/{event_id}?"
-        del params['self']
-        del params['kwargs']
-        del params['event_id']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_event.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Event)
 
+    @endpoint("edge/rest/events/{event_id}/markets")
     def get_markets(self, event_id: int, offset: int = 0, per_page: int = 20,
                     states: str = "open,suspended",
                     exchange_type: str = "back-lay",
                     odds_type: str = "DECIMAL", include_prices: bool = False,
                     price_depth: int = 3, price_mode: str = "expanded",
                     exclude_mirrored_prices: bool = False, **kwargs):
-        params = locals() | kwargs
-        url = f"edge/rest/events/{event_id}/markets?"
-        del params['self']
-        del params['kwargs']
-        del params['event_id']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_markets.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Market, 'markets')
     
+    @endpoint("edge/rest/events/{event_id}/markets/{market_id}")
     def get_market(self, event_id: int, market_id: int,
                    exchange_type: str = "back-lay", odds_type: str = "DECIMAL",
                    include_prices: bool = False, price_depth: int = 3,
                    price_mode: str = "expanded",
                    exclude_mirrored_prices: bool = False, **kwargs):
-        params = locals() | kwargs
-        url = f"edge/rest/events/{event_id}/markets/{market_id}?"
-        del params['self']
-        del params['kwargs']
-        del params['event_id']
-        del params['market_id']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_market.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Market)
 
+    @endpoint("edge/rest/events/{event_id}/markets/{market_id}/runners")
     def get_runners(self, event_id: int, market_id: int,
                     states: str = "open,suspended",
                     include_withdrawn: bool = True,
@@ -165,70 +233,47 @@ class Client:
                     exchange_type: str = "back-lay",
                     odds_type: str = "DECIMAL",
                     exclude_mirrored_prices: bool = False, **kwargs):
-        params = locals() | kwargs
-        url = f"edge/rest/events/{event_id}/markets/{market_id}/runners?"
-        del params['self']
-        del params['kwargs']
-        del params['event_id']
-        del params['market_id']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_runners.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Runner, 'runners')
 
+    @endpoint("edge/rest/events/{event_id}/markets/{market_id}/runners/"
+              "{runner_id}")
     def get_runner(self, event_id: int, market_id: int, runner_id: int,
                    include_prices: bool = False, price_depth: int = 3,
                    price_mode: str = "expanded",
                    exchange_type: str = "back-lay", odds_type: str = "DECIMAL",
                    exclude_mirrored_prices: bool = False, **kwargs):
-        params = locals() | kwargs
-        url = (f"edge/rest/events/{event_id}/markets/{market_id}/runners/"
-               f"{runner_id}?")
-        del params['self']
-        del params['kwargs']
-        del params['event_id']
-        del params['market_id']
-        del params['runner_id']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_runner.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Runner)
 
+    @endpoint("edge/rest/events/{event_id}/markets/{market_id}/runners/"
+              "{runner_id}/prices")
     def get_prices(self, event_id: int, market_id: int, runner_id: int,
                    exchange_type: str = "back-lay", odds_type: str = "DECIMAL",
                    depth: int = 3, price_mode: str = "expanded",
                    exclude_mirrored_prices: bool = False, **kwargs):
-        params = locals() | kwargs
-        url = (f"edge/rest/events/{event_id}/markets/{market_id}/runners/"
-               f"{runner_id}/prices?")
-        del params['self']
-        del params['kwargs']
-        del params['event_id']
-        del params['market_id']
-        del params['runner_id']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_prices.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Price, 'prices')
     
+    @endpoint("edge/rest/popular-markets")
     def get_popular_markets(self, exchange_type: str = "back-lay",
                             odds_type: str = "DECIMAL", price_depth: int = 3,
                             price_mode: str = "expanded",
                             old_format: bool = False, **kwargs):
-        params = locals() | kwargs
-        url = "edge/rest/popular-markets?"
-        del params['self']
-        del params['kwargs']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_popular_markets.template.url(locals())
 
         data = self.session.get(url)
         return data
     
+    @endpoint("edge/rest/popular/sports")
     def get_popular_sports(self, num_sports: int = 5):
-        params = locals()
-        url = "edge/rest/popular/sports?"
-        del params['self']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_popular_sports.template.url(locals())
 
         data = self.session.get(url)
         return data
@@ -253,9 +298,7 @@ class Client:
 
     def edit_offers(self, offers: List[dict]):
         url = "edge/rest/v2/offers"
-        payload = {
-            {"offers": {"offers": offers}}
-        }
+        payload = {"offers": offers}
         headers = {
             "accept": "application/json",
             "User-Agent": "api-doc-test-client",
@@ -280,7 +323,7 @@ class Client:
         return data
 
     def cancel_offers(self, **kwargs):
-        url = "edge/rest/v2/offers"
+        url = "edge/rest/v2/offers?"
         url = add_kwargs_to_url(url, **kwargs)
 
         data = self.session.delete(url)
@@ -292,32 +335,60 @@ class Client:
         data = self.session.delete(url)
         return data
     
+    def _bulk(self, send, chunks: List[List], max_workers: int):
+        def call(chunk):
+            try:
+                return send(chunk)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(call, chunks))
+        return merge_offer_results(chunks, results)
+
+    def submit_offers_bulk(self, offers: List[dict],
+                           odds_type: str = "DECIMAL",
+                           exchange_type: str = "back-lay",
+                           chunk_size: int = MAX_OFFERS_PER_REQUEST,
+                           max_workers: int = 4):
+        return self._bulk(
+            lambda chunk: self.submit_offers(chunk, odds_type, exchange_type),
+            chunked(offers, chunk_size), max_workers)
+
+    def edit_offers_bulk(self, offers: List[dict],
+                         chunk_size: int = MAX_OFFERS_PER_REQUEST,
+                         max_workers: int = 4):
+        return self._bulk(self.edit_offers, chunked(offers, chunk_size),
+                          max_workers)
+
+    def cancel_offers_bulk(self, offer_ids: List[int],
+                           chunk_size: int = MAX_OFFERS_PER_REQUEST,
+                           max_workers: int = 4):
+        return self._bulk(
+            lambda chunk: self.cancel_offers(
+                offer_ids=",".join(str(offer_id) for offer_id in chunk)),
+            chunked(offer_ids, chunk_size), max_workers)
+
+    @endpoint("edge/rest/v2/offers")
     def get_offers(self, offset: int = 0, per_page: int = 20,
                    include_edits: bool = False, **kwargs):
-        params = locals() | kwargs
-        url = "edge/rest/v2/offers?"
-        del params['self']
-        del params['kwargs']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_offers.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Offer, 'offers')
 
     def get_offer(self, offer_id: int, include_edits: bool = False):
         url = (f"edge/rest/v2/offers/{offer_id}?include-edits="
                f"{str(include_edits).lower()}")
         
         data = self.session.get(url)
-        return data
+        return self._parse(data, Offer)
     
+    @endpoint("edge/rest/bets/matched/aggregated")
     def get_aggregated_matched_bets(self, offset: int = 0, per_page: int = 20,
                                     aggregation_type: str = "average",
                                     **kwargs):
-        params = locals() | kwargs
-        url = "edge/rest/bets/matched/aggregated?"
-        del params['self']
-        del params['kwargs']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_aggregated_matched_bets.template.url(locals())
 
         data = self.session.get(url)
         return data
@@ -328,15 +399,12 @@ class Client:
         data = self.session.get(url)
         return data
 
+    @endpoint("edge/rest/account/positions")
     def get_positions(self, offset: int = 0, per_page: int = 20, **kwargs):
-        params = locals() | kwargs
-        url = "edge/rest/account/positions?"
-        del params['self']
-        del params['kwargs']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_positions.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Position, 'positions')
 
     def get_offer_edits(self, offer_id: int, offset: int = 0,
                         per_page: int = 20):
@@ -352,48 +420,36 @@ class Client:
         data = self.session.get(url)
         return data
 
+    @endpoint("edge/rest/reports/v1/transactions")
     def get_new_wallet_transactions(self, offset: int = 0, per_page: int = 20,
                                     **kwargs):
-        params = locals() | kwargs
-        url = "edge/rest/reports/v1/transactions?"
-        del params['self']
-        del params['kwargs']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_new_wallet_transactions.template.url(locals())
 
         data = self.session.get(url)
         return data
     
+    @endpoint("edge/rest/reports/v2/offers/current")
     def get_current_offers(self, offset: int = 0, per_page: int = 20,
                            odds_type: str = "DECIMAL", **kwargs):
-        params = locals() | kwargs
-        url = "edge/rest/reports/v2/offers/current?"
-        del params['self']
-        del params['kwargs']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_current_offers.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Offer, 'offers')
 
+    @endpoint("edge/rest/reports/v2/bets/current")
     def get_current_bets(self, offset: int = 0, per_page: int = 20,
                          odds_type: str = "DECIMAL", **kwargs):
-        params = locals() | kwargs
-        url = "edge/rest/reports/v2/bets/current?"
-        del params['self']
-        del params['kwargs']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_current_bets.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Bet, 'bets')
 
+    @endpoint("edge/rest/reports/v2/bets/settled")
     def get_settled_bets(self, offset: int = 0, per_page: int = 20, **kwargs):
-        params = locals() | kwargs
-        url = "edge/rest/reports/v2/bets/settled?"
-        del params['self']
-        del params['kwargs']
-        url = add_kwargs_to_url(url, **params)
+        url = Client.get_settled_bets.template.url(locals())
 
         data = self.session.get(url)
-        return data
+        return self._parse(data, Bet, 'bets')
     
     def get_countries(self):
         url = "bpapi/rest/lookups/countries"
@@ -437,3 +493,63 @@ class Client:
 
         data = self.session.delete(url)
         return data
+
+    def _paginate(self, fetch, key: str, per_page: int, prefetch: bool,
+                  **kwargs):
+        return iter_records(fetch, key, per_page=per_page, prefetch=prefetch,
+                            **kwargs)
+
+    def iter_sports(self, per_page: int = 100, prefetch: bool = True,
+                    **kwargs):
+        return self._paginate(self.get_sports, 'sports', per_page, prefetch,
+                              **kwargs)
+
+    def iter_events(self, per_page: int = 100, prefetch: bool = True,
+                    **kwargs):
+        return self._paginate(self.get_events, 'events', per_page, prefetch,
+                              **kwargs)
+
+    def iter_markets(self, event_id: int, per_page: int = 100,
+                     prefetch: bool = True, **kwargs):
+        return self._paginate(self.get_markets, 'markets', per_page,
+                              prefetch, event_id=event_id, **kwargs)
+
+    def iter_offers(self, per_page: int = 100, prefetch: bool = True,
+                    **kwargs):
+        return self._paginate(self.get_offers, 'offers', per_page, prefetch,
+                              **kwargs)
+
+    def iter_offer_edits(self, offer_id: int, per_page: int = 100,
+                         prefetch: bool = True):
+        return self._paginate(self.get_offer_edits, 'offer-edits', per_page,
+                              prefetch, offer_id=offer_id)
+
+    def iter_aggregated_matched_bets(self, per_page: int = 100,
+                                     prefetch: bool = True, **kwargs):
+        return self._paginate(self.get_aggregated_matched_bets, 'bets',
+                              per_page, prefetch, **kwargs)
+
+    def iter_positions(self, per_page: int = 100, prefetch: bool = True,
+                       **kwargs):
+        return self._paginate(self.get_positions, 'positions', per_page,
+                              prefetch, **kwargs)
+
+    def iter_new_wallet_transactions(self, per_page: int = 100,
+                                     prefetch: bool = True, **kwargs):
+        return self._paginate(self.get_new_wallet_transactions,
+                              'transactions', per_page, prefetch, **kwargs)
+
+    def iter_current_offers(self, per_page: int = 100, prefetch: bool = True,
+                            **kwargs):
+        return self._paginate(self.get_current_offers, 'offers', per_page,
+                              prefetch, **kwargs)
+
+    def iter_current_bets(self, per_page: int = 100, prefetch: bool = True,
+                          **kwargs):
+        return self._paginate(self.get_current_bets, 'bets', per_page,
+                              prefetch, **kwargs)
+
+    def iter_settled_bets(self, per_page: int = 100, prefetch: bool = True,
+                          **kwargs):
+        return self._paginate(self.get_settled_bets, 'bets', per_page,
+                              prefetch, **kwargs)
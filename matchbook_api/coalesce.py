@@ -0,0 +1,95 @@
+import threading
+import time
+from typing import Callable
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, ttl: float = 0.0, max_recent: int = 1024):
+        self.ttl = ttl
+        self.max_recent = max_recent
+        self.coalesced = 0
+        self.recent_hits = 0
+        self._calls = {}
+        self._tasks = {}
+        self._recent = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key, now):
+        entry = self._recent.get(key)
+        if entry is not None and entry[0] > now:
+            self.recent_hits += 1
+            return entry
+        return None
+
+    def _remember(self, key, result, cacheable):
+        if not self.ttl or (cacheable is not None and not cacheable(result)):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._recent) >= self.max_recent:
+                self._recent = {k: v for k, v in self._recent.items()
+                                if v[0] > now}
+            self._recent[key] = (now + self.ttl, result)
+
+    def do(self, key, fn: Callable, cacheable: Callable = None):
+        with self._lock:
+            entry = self._lookup(key, time.monotonic())
+            if entry is not None:
+                return entry[1]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        self._remember(key, call.result, cacheable)
+        return call.result
+
+    async def do_async(self, key, fn: Callable, cacheable: Callable = None):
+        import asyncio
+
+        with self._lock:
+            entry = self._lookup(key, time.monotonic())
+            if entry is not None:
+                return entry[1]
+            task = self._tasks.get(key)
+            if task is None:
+                task = self._tasks[key] = asyncio.ensure_future(fn())
+                task.add_done_callback(
+                    lambda _: self._done_async(key, task, cacheable))
+            else:
+                self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _done_async(self, key, task, cacheable):
+        with self._lock:
+            self._tasks.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._remember(key, task.result(), cacheable)
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
@@ -0,0 +1,65 @@
+import inspect
+import string
+import urllib.parse
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _encode_cached(key, value):
+    return encode_param(key, value)
+
+
+def encode_param(key, value):
+    if isinstance(value, bool):
+        value = str(value).lower()
+    return (urllib.parse.quote(key.replace('_', '-'))
+            + "="
+            + urllib.parse.quote(str(value)))
+
+
+def _encode(key, value):
+    try:
+        return _encode_cached(key, value)
+    except TypeError:
+        return encode_param(key, value)
+
+
+class RequestTemplate:
+    def __init__(self, path: str, defaults: dict):
+        self.path = path
+        self.path_fields = tuple(field for _, field, _, _
+                                 in string.Formatter().parse(path) if field)
+        self.params = tuple((name, default, encode_param(name, default))
+                            for name, default in defaults.items())
+
+    @classmethod
+    def for_method(cls, path: str, method):
+        parameters = inspect.signature(method).parameters.values()
+        path_fields = {field for _, field, _, _
+                       in string.Formatter().parse(path) if field}
+        defaults = {p.name: p.default for p in parameters
+                    if p.default is not inspect.Parameter.empty
+                    and p.name not in path_fields}
+        return cls(path, defaults)
+
+    def url(self, params: dict):
+        path = (self.path.format_map(params) if self.path_fields
+                else self.path)
+        query = []
+        for name, default, encoded in self.params:
+            value = params[name]
+            if value is default or (type(value) is type(default)
+                                    and value == default):
+                query.append(encoded)
+            else:
+                query.append(_encode(name, value))
+        for key, value in params.get('kwargs', {}).items():
+            query.append(_encode(key, value))
+        return path + "?" + "&".join(query)
+
+
+def endpoint(path: str):
+    def decorator(method):
+        method.template = RequestTemplate.for_method(path, method)
+        return method
+    return decorator
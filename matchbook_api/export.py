@@ -0,0 +1,217 @@
+import csv
+import json
+import logging
+import os
+import tempfile
+from collections import namedtuple
+
+
+Report = namedtuple('Report', ['method', 'cursor', 'param'])
+
+REPORTS = {
+    'settled_bets': Report('iter_settled_bets', 'settled-at', 'after'),
+    'transactions': Report('iter_new_wallet_transactions', 'timestamp',
+                           'after'),
+    'current_bets': Report('iter_current_bets', None, None),
+    'aggregated_matched_bets': Report('iter_aggregated_matched_bets', None,
+                                      None),
+}
+
+
+def flatten(record: dict, prefix: str = ""):
+    row = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            row.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, list):
+            row[prefix + key] = json.dumps(value)
+        else:
+            row[prefix + key] = value
+    return row
+
+
+class CSVWriter:
+    extension = "csv"
+
+    def __init__(self, path: str, columns, append: bool = True):
+        self.path = path
+        self.size = None
+        header = []
+        if append and os.path.exists(path) and os.path.getsize(path):
+            with open(path, newline="") as f:
+                header = next(csv.reader(f))
+        if header and set(columns) <= set(header):
+            self.size = os.path.getsize(path)
+            self.file = open(path, "a", newline="")
+            self.writer = csv.DictWriter(self.file, header)
+            return
+        self.file = open(f"{path}.tmp", "w", newline="")
+        self.writer = csv.DictWriter(
+            self.file, header + [column for column in columns
+                                 if column not in header])
+        self.writer.writeheader()
+        if header:
+            with open(path, newline="") as f:
+                self.writer.writerows(csv.DictReader(f))
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+        if self.size is None:
+            os.replace(self.file.name, self.path)
+
+    def discard(self):
+        self.file.close()
+        if self.size is None:
+            os.remove(self.file.name)
+        else:
+            os.truncate(self.path, self.size)
+
+
+class ArrowWriter:
+    extension = "arrow"
+
+    def __init__(self, path: str, columns, append: bool = True):
+        import pyarrow
+
+        self.pa = pyarrow
+        self.path = path
+        self.tmp = f"{path}.tmp"
+        self.columns = list(columns)
+        self.schema = None
+        self.writer = None
+
+    def _open(self, schema):
+        return self.pa.ipc.new_file(self.tmp, schema)
+
+    def write(self, rows):
+        rows = [{column: row.get(column) for column in self.columns}
+                for row in rows]
+        if self.writer is None:
+            self.schema = self.pa.Table.from_pylist(rows).schema
+            self.writer = self._open(self.schema)
+        table = self.pa.Table.from_pylist(rows, schema=self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            os.replace(self.tmp, self.path)
+
+    def discard(self):
+        if self.writer is not None:
+            self.writer.close()
+            os.remove(self.tmp)
+
+
+class ParquetWriter(ArrowWriter):
+    extension = "parquet"
+
+    def _open(self, schema):
+        import pyarrow.parquet
+
+        return pyarrow.parquet.ParquetWriter(self.tmp, schema)
+
+
+WRITERS = {
+    'csv': CSVWriter,
+    'arrow': ArrowWriter,
+    'parquet': ParquetWriter,
+}
+
+
+class ReportExporter:
+    def __init__(self, client, directory: str, format: str = "csv",
+                 chunk_size: int = 10000, per_page: int = 500):
+        self.client = client
+        self.directory = directory
+        self.writer_class = WRITERS[format]
+        self.chunk_size = chunk_size
+        self.per_page = per_page
+        self.state_file = os.path.join(directory, "export_state.json")
+        os.makedirs(directory, exist_ok=True)
+
+    def load_state(self):
+        if not os.path.exists(self.state_file):
+            return {}
+        with open(self.state_file) as f:
+            return json.load(f)
+
+    def save_state(self, state):
+        path = self.state_file + ".tmp"
+        with open(path, "w") as f:
+            json.dump(state, f)
+        os.replace(path, self.state_file)
+
+    def _path(self, name: str, incremental: bool):
+        extension = self.writer_class.extension
+        if self.writer_class is CSVWriter:
+            return os.path.join(self.directory, f"{name}.{extension}")
+        folder = os.path.join(self.directory, name)
+        os.makedirs(folder, exist_ok=True)
+        if not incremental:
+            return os.path.join(folder, f"snapshot.{extension}")
+        part = len([f for f in os.listdir(folder) if f.endswith(extension)])
+        return os.path.join(folder, f"part-{part:05d}.{extension}")
+
+    def _commit(self, name: str, incremental: bool, spill, names):
+        spill.seek(0)
+        writer = self.writer_class(self._path(name, incremental), names,
+                                   incremental)
+        try:
+            chunk = []
+            for line in spill:
+                chunk.append(json.loads(line))
+                if len(chunk) >= self.chunk_size:
+                    writer.write(chunk)
+                    chunk = []
+            if chunk:
+                writer.write(chunk)
+        except BaseException:
+            writer.discard()
+            raise
+        writer.close()
+
+    def sync(self, name: str, **kwargs):
+        report = REPORTS[name]
+        state = self.load_state()
+        previous = state.get(name, {})
+        incremental = report.cursor is not None
+        if incremental and previous.get('cursor') is not None:
+            kwargs[report.param] = previous['cursor']
+        seen = set(previous.get('ids', []))
+        cursor = previous.get('cursor')
+        cursor_ids = list(seen)
+
+        records = getattr(self.client, report.method)(per_page=self.per_page,
+                                                      **kwargs)
+        names = {}
+        count = 0
+        with tempfile.TemporaryFile("w+", dir=self.directory) as spill:
+            for record in records:
+                if incremental:
+                    value = record.get(report.cursor)
+                    if record.get('id') in seen:
+                        continue
+                    if cursor is None or (value is not None
+                                          and value > cursor):
+                        cursor, cursor_ids = value, []
+                    if value == cursor:
+                        cursor_ids.append(record.get('id'))
+                row = flatten(record)
+                names.update(dict.fromkeys(row))
+                spill.write(json.dumps(row) + "\n")
+                count += 1
+            if count:
+                self._commit(name, incremental, spill, list(names))
+
+        if incremental:
+            state[name] = {'cursor': cursor, 'ids': cursor_ids}
+            self.save_state(state)
+        logging.info(f"Exported {count} rows of {name}.")
+        return count
+
+    def sync_all(self):
+        return {name: self.sync(name) for name in REPORTS}
@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from typing import Callable
+
+from .session import Session
+
+
+HEARTBEAT_URL = "edge/rest/v1/heartbeat"
+
+HEARTBEAT_HEADERS = {
+    "accept": "application/json",
+    "User-Agent": "api-doc-test-client",
+    "content-type": "application/json",
+    "Accept-Encoding": "gzip"
+}
+
+
+class HeartbeatKeeper:
+    def __init__(self, client, timeout: int = 20, fraction: float = 0.4,
+                 on_missed: Callable = None, on_late: Callable = None,
+                 late_threshold: float = None, transport=None):
+        self.client = client
+        self.timeout = timeout
+        self.interval = timeout * fraction
+        self.late_threshold = (late_threshold if late_threshold is not None
+                               else self.interval / 4)
+        self.on_missed = on_missed
+        self.on_late = on_late
+        self.session = Session(log=False,
+                               rate_limiter=client.session.rate_limiter,
+                               middleware=client.session.middleware
+                               + [self._authenticate],
+                               transport=transport)
+        self.session.url = client.session.url
+        self.beats = 0
+        self.missed = 0
+        self.late = 0
+        self.last_beat = None
+        self.last_latency = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _authenticate(self, method, url, kwargs, call_next):
+        token = self.client.session_token
+        if token is not None:
+            kwargs = kwargs | {
+                'headers': kwargs['headers'] | {'session-token': token}}
+        return call_next(method, url, kwargs)
+
+    def beat(self):
+        start = time.monotonic()
+        try:
+            data = self.session.post(HEARTBEAT_URL, {"timeout": self.timeout},
+                                     HEARTBEAT_HEADERS)
+        except Exception as e:
+            data = e
+        now = time.monotonic()
+        self.last_latency = now - start
+        if isinstance(data, Exception):
+            self.missed += 1
+            logging.error(f"Heartbeat failed: {data}")
+            if self.on_missed is not None:
+                self.on_missed(data)
+            return data
+        if self.last_beat is not None:
+            delay = now - self.last_beat - self.interval
+            if delay > self.late_threshold:
+                self.late += 1
+                logging.warning(f"Heartbeat renewed {delay:.2f}s late.")
+                if self.on_late is not None:
+                    self.on_late(delay)
+        self.beats += 1
+        self.last_beat = now
+        return data
+
+    def run(self):
+        while not self._stopped.is_set():
+            due = time.monotonic() + self.interval
+            self.beat()
+            self._stopped.wait(max(0.0, due - time.monotonic()))
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True,
+                                        name="matchbook-heartbeat")
+        self._thread.start()
+
+    def stop(self, release: bool = True):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if release:
+            data = self.session.delete(HEARTBEAT_URL)
+            if isinstance(data, Exception):
+                logging.error(f"Heartbeat release failed: {data}")
+            return data
@@ -0,0 +1,132 @@
+import bisect
+import re
+import threading
+from collections import defaultdict
+from typing import Callable
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, float("inf"))
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_name(method: str, url: str):
+    return method + " " + _ID_SEGMENT.sub("/{id}", url.split("?", 1)[0])
+
+
+class Histogram:
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.requests = 0
+        self.errors_4xx = 0
+        self.errors_5xx = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'errors_4xx': self.errors_4xx,
+            'errors_5xx': self.errors_5xx,
+            'failures': self.failures,
+            'rate_limited': self.rate_limited,
+            'retries': self.retries,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'latency_sum': self.latency.sum,
+            'latency_p50': self.latency.quantile(0.5),
+            'latency_p99': self.latency.quantile(0.99),
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self.endpoints = defaultdict(EndpointStats)
+        self.hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable):
+        self.hooks.append(hook)
+
+    def observe(self, method: str, url: str, status_code: int, start: float,
+                end: float, bytes_sent: int = 0, bytes_received: int = 0):
+        name = endpoint_name(method, url)
+        with self._lock:
+            stats = self.endpoints[name]
+            stats.requests += 1
+            stats.latency.observe(end - start)
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            if status_code == 0:
+                stats.failures += 1
+            if status_code == 429:
+                stats.rate_limited += 1
+            if 400 <= status_code < 500:
+                stats.errors_4xx += 1
+            elif status_code >= 500:
+                stats.errors_5xx += 1
+        for hook in self.hooks:
+            hook({'endpoint': name, 'method': method, 'url': url,
+                  'status': status_code, 'start': start, 'end': end,
+                  'bytes_sent': bytes_sent,
+                  'bytes_received': bytes_received})
+
+    def retry(self, method: str, url: str):
+        with self._lock:
+            self.endpoints[endpoint_name(method, url)].retries += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {name: stats.as_dict()
+                    for name, stats in self.endpoints.items()}
+
+    def prometheus(self, prefix: str = "matchbook"):
+        lines = []
+        with self._lock:
+            for name, stats in self.endpoints.items():
+                label = f'endpoint="{name}"'
+                for key in ('requests', 'errors_4xx', 'errors_5xx',
+                            'failures', 'rate_limited', 'retries',
+                            'bytes_sent', 'bytes_received'):
+                    lines.append(f"{prefix}_{key}_total{{{label}}} "
+                                 f"{getattr(stats, key)}")
+                seen = 0
+                for bound, count in zip(stats.latency.buckets,
+                                        stats.latency.counts):
+                    seen += count
+                    le = "+Inf" if bound == float("inf") else bound
+                    lines.append(f'{prefix}_latency_seconds_bucket{{{label},'
+                                 f'le="{le}"}} {seen}')
+                lines.append(f"{prefix}_latency_seconds_sum{{{label}}} "
+                             f"{stats.latency.sum}")
+                lines.append(f"{prefix}_latency_seconds_count{{{label}}} "
+                             f"{stats.latency.count}")
+        return "\n".join(lines) + "\n"
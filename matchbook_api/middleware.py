@@ -0,0 +1,119 @@
+import logging
+import random
+import time
+
+
+def retryable_errors():
+    import requests
+
+    return requests.ConnectionError, requests.Timeout
+
+
+def async_retryable_errors():
+    import asyncio
+
+    import aiohttp
+
+    return aiohttp.ClientConnectionError, asyncio.TimeoutError
+
+
+class RetryMiddleware:
+    def __init__(self, retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 10.0,
+                 statuses: tuple = (429, 500, 502, 503, 504),
+                 methods: tuple = ("GET", "PUT", "DELETE"),
+                 metrics=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self.methods = methods
+        self.metrics = metrics
+
+    def delay(self, attempt: int):
+        return random.uniform(0, min(self.max_backoff,
+                                     self.backoff * 2 ** attempt))
+
+    def __call__(self, method, url, kwargs, call_next):
+        retries = self.retries if method in self.methods else 0
+        for attempt in range(retries + 1):
+            try:
+                r = call_next(method, url, kwargs)
+            except retryable_errors() as e:
+                if attempt == retries:
+                    raise
+                logging.warning(f"HTTP {method} request failed ({e}), "
+                                f"retrying.")
+            else:
+                if r.status_code not in self.statuses or attempt == retries:
+                    return r
+                logging.warning(f"HTTP {method} request returned "
+                                f"{r.status_code}, retrying.")
+            if self.metrics is not None:
+                self.metrics.retry(method, url)
+            time.sleep(self.delay(attempt))
+
+
+class ReloginMiddleware:
+    def __init__(self, client, statuses: tuple = (401,)):
+        self.client = client
+        self.statuses = statuses
+
+    def __call__(self, method, url, kwargs, call_next):
+        token = self.client.session_token
+        r = call_next(method, url, kwargs)
+        if (r.status_code not in self.statuses or token is None
+                or url.startswith("bpapi/rest/security/session")):
+            return r
+        with self.client.login_lock:
+            if self.client.session_token == token:
+                logging.info("Session expired, logging in again.")
+                if isinstance(self.client.login(), Exception):
+                    return r
+        return call_next(method, url, kwargs)
+
+
+class AsyncRetryMiddleware(RetryMiddleware):
+    async def __call__(self, method, url, kwargs, call_next):
+        import asyncio
+
+        retries = self.retries if method in self.methods else 0
+        for attempt in range(retries + 1):
+            try:
+                r = await call_next(method, url, kwargs)
+            except async_retryable_errors() as e:
+                if attempt == retries:
+                    raise
+                logging.warning(f"HTTP {method} request failed ({e}), "
+                                f"retrying.")
+            else:
+                if r.status_code not in self.statuses or attempt == retries:
+                    return r
+                logging.warning(f"HTTP {method} request returned "
+                                f"{r.status_code}, retrying.")
+            if self.metrics is not None:
+                self.metrics.retry(method, url)
+            await asyncio.sleep(self.delay(attempt))
+
+
+class AsyncReloginMiddleware(ReloginMiddleware):
+    def __init__(self, client, statuses: tuple = (401,)):
+        super().__init__(client, statuses)
+        self._lock = None
+
+    async def __call__(self, method, url, kwargs, call_next):
+        import asyncio
+
+        token = self.client.session_token
+        r = await call_next(method, url, kwargs)
+        if (r.status_code not in self.statuses or token is None
+                or url.startswith("bpapi/rest/security/session")):
+            return r
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.client.session_token == token:
+                logging.info("Session expired, logging in again.")
+                if isinstance(await self.client.login(), Exception):
+                    return r
+        return await call_next(method, url, kwargs)
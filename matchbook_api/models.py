@@ -0,0 +1,132 @@
+class Nested:
+    def __init__(self, key: str, model):
+        self.key = key
+        self.model = model
+
+    def __set_name__(self, owner, name):
+        self.slot = owner.__dict__['_' + name]
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, owner)
+        if isinstance(value, list):
+            value = tuple(self.model(item) for item in value)
+            self.slot.__set__(obj, value)
+        return value
+
+
+class Model:
+    __slots__ = ('_extra',)
+    _fields = {}
+    _nested = {}
+    _known = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = {attr: attr.replace('_', '-')
+                       for attr in cls.__slots__ if not attr.startswith('_')}
+        cls._nested = {'_' + name: value.key
+                       for name, value in vars(cls).items()
+                       if isinstance(value, Nested)}
+        cls._known = frozenset(cls._fields.values()) | frozenset(
+            cls._nested.values())
+
+    def __init__(self, data: dict):
+        for attr, key in self._fields.items():
+            setattr(self, attr, data.get(key))
+        for slot, key in self._nested.items():
+            setattr(self, slot, data.get(key, ()))
+        self._extra = {key: value for key, value in data.items()
+                       if key not in self._known}
+
+    def _is_field(self, attr: str):
+        return attr in self._fields or '_' + attr in self._nested
+
+    def __getitem__(self, key: str):
+        attr = key.replace('-', '_')
+        if self._is_field(attr):
+            return getattr(self, attr)
+        return self._extra[key]
+
+    def get(self, key: str, default=None):
+        attr = key.replace('-', '_')
+        if self._is_field(attr):
+            return getattr(self, attr)
+        return self._extra.get(key, default)
+
+    def __contains__(self, key):
+        if not isinstance(key, str):
+            return False
+        attr = key.replace('-', '_')
+        if '_' + attr in self._nested or key in self._extra:
+            return True
+        return attr in self._fields and getattr(self, attr) is not None
+
+    def keys(self):
+        return ([key for attr, key in self._fields.items()
+                 if getattr(self, attr) is not None]
+                + list(self._nested.values()) + list(self._extra))
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __repr__(self):
+        fields = ", ".join(f"{attr}={getattr(self, attr)!r}"
+                           for attr in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+    def to_dict(self):
+        data = {key: getattr(self, attr)
+                for attr, key in self._fields.items()}
+        for slot, key in self._nested.items():
+            data[key] = [item.to_dict() for item in getattr(self, slot[1:])]
+        data.update(self._extra)
+        return data
+
+
+class Price(Model):
+    __slots__ = ('side', 'odds', 'decimal_odds', 'available_amount',
+                 'currency', 'exchange_type', 'odds_type')
+
+
+class Runner(Model):
+    __slots__ = ('id', 'event_id', 'market_id', 'name', 'status',
+                 'withdrawn', 'volume', 'handicap', '_prices')
+    prices = Nested('prices', Price)
+
+
+class Market(Model):
+    __slots__ = ('id', 'event_id', 'name', 'status', 'start',
+                 'in_running_flag', 'allow_live_betting', 'market_type',
+                 'volume', 'back_overround', 'lay_overround', '_runners')
+    runners = Nested('runners', Runner)
+
+
+class Event(Model):
+    __slots__ = ('id', 'name', 'sport_id', 'category_id', 'start', 'status',
+                 'in_running_flag', 'allow_live_betting', 'volume',
+                 '_markets')
+    markets = Nested('markets', Market)
+
+
+class Bet(Model):
+    __slots__ = ('id', 'offer_id', 'event_id', 'market_id', 'runner_id',
+                 'side', 'odds', 'decimal_odds', 'stake', 'potential_profit',
+                 'commission', 'status', 'created_at')
+
+
+class Offer(Model):
+    __slots__ = ('id', 'event_id', 'market_id', 'runner_id', 'side', 'odds',
+                 'decimal_odds', 'stake', 'remaining', 'potential_profit',
+                 'potential_liability', 'status', 'created_at',
+                 'in_running_flag', '_matched_bets')
+    matched_bets = Nested('matched-bets', Bet)
+
+
+class Position(Model):
+    __slots__ = ('event_id', 'market_id', 'runner_id', 'potential_profit',
+                 'potential_loss')
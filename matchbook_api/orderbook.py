@@ -0,0 +1,89 @@
+from typing import Dict
+
+import numpy as np
+
+
+class Ladder:
+    __slots__ = ('side', 'odds', 'amounts', 'total', 'weighted_odds')
+
+    def __init__(self, side: str, depth: int = 3):
+        self.side = side
+        self.odds = np.zeros(depth)
+        self.amounts = np.zeros(depth)
+        self.total = 0.0
+        self.weighted_odds = 0.0
+
+    @property
+    def best(self):
+        return self.odds[0] if self.amounts[0] > 0 else None
+
+    def set(self, prices):
+        depth = len(self.odds)
+        prices = sorted(prices, key=lambda p: p['odds'],
+                        reverse=self.side == 'back')[:depth]
+        odds = np.zeros(depth)
+        amounts = np.zeros(depth)
+        for i, price in enumerate(prices):
+            odds[i] = price['odds']
+            amounts[i] = price['available-amount']
+        changed = np.flatnonzero((odds != self.odds)
+                                 | (amounts != self.amounts))
+        if len(changed):
+            self.odds = odds
+            self.amounts = amounts
+            self.total = float(amounts.sum())
+            self.weighted_odds = (float(odds @ amounts) / self.total
+                                  if self.total else 0.0)
+        return changed
+
+
+class RunnerBook:
+    __slots__ = ('runner_id', 'back', 'lay', 'status')
+
+    def __init__(self, runner_id: int, depth: int = 3):
+        self.runner_id = runner_id
+        self.back = Ladder('back', depth)
+        self.lay = Ladder('lay', depth)
+        self.status = None
+
+    def update(self, runner: dict):
+        self.status = runner.get('status', self.status)
+        back, lay = [], []
+        for price in runner.get('prices', []):
+            (back if price['side'] == 'back' else lay).append(price)
+        changes = {}
+        changed = self.back.set(back)
+        if len(changed):
+            changes['back'] = changed
+        changed = self.lay.set(lay)
+        if len(changed):
+            changes['lay'] = changed
+        return changes
+
+
+class MarketBook:
+    def __init__(self, market_id: int, depth: int = 3):
+        self.market_id = market_id
+        self.depth = depth
+        self.runners: Dict[int, RunnerBook] = {}
+        self.status = None
+
+    def __getitem__(self, runner_id: int):
+        return self.runners[runner_id]
+
+    def apply(self, payload: dict):
+        if 'runners' in payload:
+            self.status = payload.get('status', self.status)
+            runners = payload['runners']
+        else:
+            runners = [payload]
+        changes = {}
+        for runner in runners:
+            book = self.runners.get(runner['id'])
+            if book is None:
+                book = self.runners[runner['id']] = RunnerBook(runner['id'],
+                                                               self.depth)
+            changed = book.update(runner)
+            if changed:
+                changes[runner['id']] = changed
+        return changes
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _next_offset(page, offset, per_page, key):
+    records = len(page.get(key, []))
+    total = page.get('total')
+    if not records or (total is None and records < per_page):
+        return None
+    offset += records
+    if total is not None and offset >= total:
+        return None
+    return offset
+
+
+def iter_records(fetch, key: str, per_page: int = 100, offset: int = 0,
+                 prefetch: bool = True, **kwargs):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch, offset=offset, per_page=per_page,
+                                 **kwargs)
+        while future is not None:
+            page = future.result()
+            if isinstance(page, Exception):
+                raise page
+            offset = _next_offset(page, offset, per_page, key)
+            if offset is None:
+                future = None
+            elif prefetch:
+                future = executor.submit(fetch, offset=offset,
+                                         per_page=per_page, **kwargs)
+            yield from page.get(key, [])
+            if offset is not None and not prefetch:
+                future = executor.submit(fetch, offset=offset,
+                                         per_page=per_page, **kwargs)
+
+
+async def aiter_records(fetch, key: str, per_page: int = 100, offset: int = 0,
+                        prefetch: bool = True, **kwargs):
+    import asyncio
+
+    task = asyncio.ensure_future(fetch(offset=offset, per_page=per_page,
+                                       **kwargs))
+    while task is not None:
+        page = await task
+        if isinstance(page, Exception):
+            raise page
+        offset = _next_offset(page, offset, per_page, key)
+        if offset is None:
+            task = None
+        elif prefetch:
+            task = asyncio.ensure_future(fetch(offset=offset,
+                                               per_page=per_page, **kwargs))
+        for record in page.get(key, []):
+            yield record
+        if offset is not None and not prefetch:
+            task = asyncio.ensure_future(fetch(offset=offset,
+                                               per_page=per_page, **kwargs))
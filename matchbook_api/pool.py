@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable
+
+from .client import Client
+from .ratelimit import RateLimiter
+from .transport import KEEPALIVE_OPTIONS, KeepAliveAdapter, RequestsTransport
+
+
+class ClientPool:
+    def __init__(self, accounts: Dict = None, pool_connections: int = 10,
+                 pool_maxsize: int = 20, max_workers: int = 10,
+                 timeout: tuple = (3.05, 30), **client_kwargs):
+        self.adapter = KeepAliveAdapter(socket_options=KEEPALIVE_OPTIONS,
+                                        pool_connections=pool_connections,
+                                        pool_maxsize=pool_maxsize)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.client_kwargs = client_kwargs
+        self.clients: Dict[str, Client] = {}
+        for account_id, (username, password) in (accounts or {}).items():
+            self.add(account_id, username, password)
+
+    def add(self, account_id, username: str, password: str,
+            rate_limiter: RateLimiter = None, **kwargs):
+        transport = RequestsTransport(timeout=self.timeout,
+                                      adapter=self.adapter)
+        client = Client(username, password,
+                        rate_limiter=(rate_limiter if rate_limiter is not None
+                                      else RateLimiter()),
+                        transport=transport, **(self.client_kwargs | kwargs))
+        self.clients[account_id] = client
+        return client
+
+    def remove(self, account_id):
+        client = self.clients.pop(account_id)
+        client.session.transport.close()
+        return client
+
+    def __getitem__(self, account_id):
+        return self.clients[account_id]
+
+    def __contains__(self, account_id):
+        return account_id in self.clients
+
+    def __iter__(self):
+        return iter(self.clients)
+
+    def __len__(self):
+        return len(self.clients)
+
+    def call(self, account_id, method: str, *args, **kwargs):
+        return getattr(self.clients[account_id], method)(*args, **kwargs)
+
+    def fan_out(self, method: str, *args, account_ids: Iterable = None,
+                **kwargs):
+        account_ids = list(self.clients if account_ids is None
+                           else account_ids)
+
+        def call(account_id):
+            try:
+                return self.call(account_id, method, *args, **kwargs)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(account_ids, executor.map(call, account_ids)))
+
+    def login_all(self, **kwargs):
+        return self.fan_out('login', **kwargs)
+
+    def logout_all(self, **kwargs):
+        return self.fan_out('logout', **kwargs)
+
+    def get_balances(self, **kwargs):
+        return self.fan_out('get_balance', **kwargs)
+
+    def get_positions(self, **kwargs):
+        return self.fan_out('get_positions', **kwargs)
+
+    def stats(self):
+        pools = self.adapter.poolmanager.pools
+        pools = [pools[key] for key in pools.keys()]
+        connections = sum(pool.num_connections for pool in pools)
+        requests_sent = sum(pool.num_requests for pool in pools)
+        return {
+            'accounts': len(self.clients),
+            'connections': connections,
+            'requests': requests_sent,
+        }
+
+    def close(self):
+        for client in self.clients.values():
+            client.session.transport.session.close()
+        self.adapter.close()
@@ -0,0 +1,177 @@
+import logging
+import threading
+from typing import Dict
+
+import numpy as np
+
+
+OPEN_STATUSES = ('open', 'edited', 'partially-matched', 'delayed')
+
+
+def _odds(record):
+    return record.get('decimal-odds') or record['odds']
+
+
+def _contribution(side, odds, stake):
+    if side == 'back':
+        return stake * (odds - 1), -stake
+    return -stake * (odds - 1), stake
+
+
+class MarketLedger:
+    def __init__(self, market_id: int):
+        self.market_id = market_id
+        self.runner_index: Dict[int, int] = {}
+        self.matched_win = np.zeros(0)
+        self.matched_lose = np.zeros(0)
+        self.unmatched_win = np.zeros(0)
+        self.unmatched_lose = np.zeros(0)
+
+    def index(self, runner_id: int):
+        i = self.runner_index.get(runner_id)
+        if i is None:
+            i = self.runner_index[runner_id] = len(self.runner_index)
+            for name in ('matched_win', 'matched_lose', 'unmatched_win',
+                         'unmatched_lose'):
+                setattr(self, name, np.append(getattr(self, name), 0.0))
+        return i
+
+    def add_matched(self, runner_id, side, odds, stake):
+        i = self.index(runner_id)
+        win, lose = _contribution(side, odds, stake)
+        self.matched_win[i] += win
+        self.matched_lose[i] += lose
+
+    def add_unmatched(self, runner_id, side, odds, stake, sign: int = 1):
+        i = self.index(runner_id)
+        win, lose = _contribution(side, odds, stake)
+        self.unmatched_win[i] += sign * min(win, 0.0)
+        self.unmatched_lose[i] += sign * min(lose, 0.0)
+
+    def pnl(self, unmatched: bool = True):
+        win = self.matched_win
+        lose = self.matched_lose
+        if unmatched:
+            win = win + self.unmatched_win
+            lose = lose + self.unmatched_lose
+        total_lose = lose.sum()
+        return win + total_lose - lose, total_lose
+
+    def exposure(self, unmatched: bool = True):
+        outcomes, other = self.pnl(unmatched)
+        worst = min(outcomes.min(initial=0.0), other)
+        return float(max(0.0, -worst))
+
+    def runner_pnl(self, unmatched: bool = False):
+        outcomes, _ = self.pnl(unmatched)
+        return {runner_id: float(outcomes[i])
+                for runner_id, i in self.runner_index.items()}
+
+
+class PositionLedger:
+    def __init__(self, client=None):
+        self.client = client
+        self.markets: Dict[int, MarketLedger] = {}
+        self.offers: Dict[int, dict] = {}
+        self.bet_ids = set()
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def market(self, market_id: int):
+        ledger = self.markets.get(market_id)
+        if ledger is None:
+            ledger = self.markets[market_id] = MarketLedger(market_id)
+        return ledger
+
+    def add_bet(self, bet: dict):
+        with self._lock:
+            if bet.get('id') is not None:
+                if bet['id'] in self.bet_ids:
+                    return
+                self.bet_ids.add(bet['id'])
+            self.market(bet['market-id']).add_matched(
+                bet['runner-id'], bet['side'], _odds(bet), bet['stake'])
+
+    def _remove_unmatched(self, offer_id):
+        offer = self.offers.pop(offer_id, None)
+        if offer is not None:
+            self.market(offer['market-id']).add_unmatched(
+                offer['runner-id'], offer['side'], _odds(offer),
+                offer['remaining'], sign=-1)
+
+    def apply_offer(self, offer: dict):
+        with self._lock:
+            self._remove_unmatched(offer['id'])
+            for bet in offer.get('matched-bets', []):
+                self.add_bet({**bet, **{key: offer[key] for key in (
+                    'market-id', 'runner-id', 'side') if key not in bet}})
+            if (offer.get('status') in OPEN_STATUSES
+                    and offer.get('remaining', 0) > 0):
+                self.offers[offer['id']] = offer
+                self.market(offer['market-id']).add_unmatched(
+                    offer['runner-id'], offer['side'], _odds(offer),
+                    offer['remaining'])
+
+    def apply(self, response):
+        if isinstance(response, Exception):
+            return
+        offers = response.get('offers', [response]
+                              if 'id' in response else [])
+        for offer in offers:
+            self.apply_offer(offer)
+
+    def clear(self):
+        with self._lock:
+            self.markets.clear()
+            self.offers.clear()
+            self.bet_ids.clear()
+
+    def reconcile(self):
+        bets = list(self.client.iter_current_bets())
+        offers = list(self.client.iter_current_offers())
+        with self._lock:
+            self.clear()
+            for bet in bets:
+                self.add_bet(bet)
+            for offer in offers:
+                self.apply_offer(offer)
+
+    def run(self, interval: float):
+        while not self._stopped.wait(interval):
+            try:
+                self.reconcile()
+            except Exception:
+                logging.exception("Position reconcile failed.")
+
+    def start(self, interval: float = 60.0):
+        self.reconcile()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, args=(interval,),
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def exposure(self, market_id: int = None):
+        with self._lock:
+            if market_id is not None:
+                ledger = self.markets.get(market_id)
+                return ledger.exposure() if ledger is not None else 0.0
+            return sum(ledger.exposure() for ledger in self.markets.values())
+
+    def check(self, market_id: int, runner_id: int, side: str, odds: float,
+              stake: float, max_exposure: float):
+        with self._lock:
+            ledger = self.market(market_id)
+            i = ledger.index(runner_id)
+            win, lose = _contribution(side, odds, stake)
+            outcomes, other = ledger.pnl()
+            outcomes = outcomes + min(lose, 0.0)
+            outcomes[i] += min(win, 0.0) - min(lose, 0.0)
+            worst = min(outcomes.min(initial=0.0), other + min(lose, 0.0))
+            return bool(max(0.0, -worst) <= max_exposure)
@@ -0,0 +1,122 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+from .positions import OPEN_STATUSES
+
+
+def _same(a: float, b: float):
+    return abs(a - b) < 1e-9
+
+
+def diff_quotes(offers: List[dict], quotes: List[dict]):
+    offers = sorted(offers, key=lambda offer: offer['odds'])
+    quotes = sorted(quotes, key=lambda quote: quote['odds'])
+    for same_stake in (True, False):
+        for quote in list(quotes):
+            for offer in offers:
+                if (_same(offer['odds'], quote['odds'])
+                        and (not same_stake
+                             or _same(offer['remaining'], quote['stake']))):
+                    offers.remove(offer)
+                    quotes.remove(quote)
+                    if not same_stake:
+                        yield 'edit', offer, quote
+                    break
+    for offer, quote in zip(list(offers), list(quotes)):
+        offers.remove(offer)
+        quotes.remove(quote)
+        yield 'edit', offer, quote
+    for offer in offers:
+        yield 'cancel', offer, None
+    for quote in quotes:
+        yield 'submit', None, quote
+
+
+class QuoteManager:
+    def __init__(self, client, ledger=None, chunk_size: int = 25,
+                 max_workers: int = 4, **offer_filters):
+        self.client = client
+        self.ledger = ledger
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.offer_filters = offer_filters
+        self.offers: Dict[int, dict] = {}
+        self.stale = True
+        self._lock = threading.RLock()
+
+    def sync(self):
+        offers = self.client.iter_offers(**self.offer_filters)
+        with self._lock:
+            self.offers = {offer['id']: dict(offer) for offer in offers
+                           if offer.get('status') in OPEN_STATUSES}
+            self.stale = False
+
+    def track(self, offer: dict):
+        with self._lock:
+            if (offer.get('status') in OPEN_STATUSES
+                    and offer.get('remaining', 0) > 0):
+                self.offers[offer['id']] = dict(offer)
+            else:
+                self.offers.pop(offer['id'], None)
+
+    def live(self, runner_id: int, side: str):
+        with self._lock:
+            return [offer for offer in self.offers.values()
+                    if offer['runner-id'] == runner_id
+                    and offer['side'] == side]
+
+    def plan(self, quotes: Dict[int, List[dict]]):
+        plan = {'cancel': [], 'edit': [], 'submit': []}
+        for runner_id, runner_quotes in quotes.items():
+            by_side = defaultdict(list)
+            for quote in runner_quotes:
+                by_side[quote['side']].append(quote)
+            for side in ('back', 'lay'):
+                for action, offer, quote in diff_quotes(
+                        self.live(runner_id, side), by_side[side]):
+                    if action == 'cancel':
+                        plan['cancel'].append(offer['id'])
+                    elif action == 'edit':
+                        plan['edit'].append({'id': offer['id'],
+                                             'odds': quote['odds'],
+                                             'stake': quote['stake']})
+                    else:
+                        plan['submit'].append(
+                            {'runner-id': runner_id, 'side': side}
+                            | quote)
+        return plan
+
+    def _apply(self, result):
+        failed = {id(offer) for offer in result['failed']}
+        for offer in result['offers']:
+            if id(offer) not in failed:
+                self.track(offer)
+        if result['failed'] or result['errors']:
+            self.stale = True
+        if self.ledger is not None:
+            self.ledger.apply(result)
+
+    def requote(self, quotes: Dict[int, List[dict]]):
+        if self.stale:
+            self.sync()
+        plan = self.plan(quotes)
+        results = {}
+        steps = (('cancel', self.client.cancel_offers_bulk),
+                 ('edit', self.client.edit_offers_bulk),
+                 ('submit', self.client.submit_offers_bulk))
+        try:
+            for action, send in steps:
+                if plan[action]:
+                    results[action] = send(plan[action],
+                                           chunk_size=self.chunk_size,
+                                           max_workers=self.max_workers)
+                    self._apply(results[action])
+        except BaseException:
+            self.stale = True
+            raise
+        logging.info(f"Requoted: {len(plan['cancel'])} cancelled, "
+                     f"{len(plan['edit'])} edited, "
+                     f"{len(plan['submit'])} submitted.")
+        return plan, results
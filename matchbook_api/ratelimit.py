@@ -0,0 +1,163 @@
+import bisect
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+DEFAULT_RATES = {
+    'global': (20.0, 20.0),
+    'orders': (10.0, 10.0),
+    'market-data': (10.0, 10.0),
+    'reports': (2.0, 4.0),
+    'session': (1.0, 2.0),
+}
+
+PRIORITIES = {
+    'orders': 0,
+    'session': 0,
+    'market-data': 1,
+    'reports': 2,
+}
+
+
+def classify(method: str, url: str):
+    path = url.split("?", 1)[0]
+    if "security/session" in path:
+        return 'session'
+    if "heartbeat" in path or ("offers" in path and method != "GET"):
+        return 'orders'
+    if "reports" in path or "bets" in path or "transactions" in path:
+        return 'reports'
+    return 'market-data'
+
+
+class LocalStore:
+    def __init__(self):
+        self._state = {}
+
+    @contextmanager
+    def transaction(self):
+        yield self._state
+
+
+class FileStore:
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextmanager
+    def transaction(self):
+        import fcntl
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "r+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                content = f.read()
+                state = json.loads(content) if content else {}
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    def __init__(self, rates: dict = None, priorities: dict = None,
+                 path: str = None):
+        self.rates = DEFAULT_RATES | (rates or {})
+        self.priorities = PRIORITIES | (priorities or {})
+        self.store = FileStore(path) if path is not None else LocalStore()
+        self.throttled = 0
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._counter = itertools.count()
+
+    def _refill(self, state, bucket, now):
+        rate, capacity = self.rates[bucket]
+        tokens, updated = state.get(bucket, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        state[bucket] = [tokens, now]
+        return tokens
+
+    def _take(self, category):
+        now = time.time()
+        with self.store.transaction() as state:
+            tokens = min(self._refill(state, 'global', now),
+                         self._refill(state, category, now))
+            if tokens >= 1:
+                state['global'][0] -= 1
+                state[category][0] -= 1
+                return 0.0
+        rate = min(self.rates['global'][0], self.rates[category][0])
+        return (1 - tokens) / rate
+
+    def _available(self, category):
+        now = time.time()
+        with self.store.transaction() as state:
+            return min(self._refill(state, 'global', now),
+                       self._refill(state, category, now)) >= 1
+
+    def _try(self, ticket):
+        for waiter in self._waiters:
+            if waiter == ticket:
+                wait = self._take(ticket[2])
+                if wait == 0:
+                    self._waiters.remove(ticket)
+                    self._condition.notify_all()
+                return wait
+            if self._available(waiter[2]):
+                self._condition.notify_all()
+                return 0.01
+        return 0.01
+
+    def _ticket(self, method, url):
+        category = classify(method, url)
+        return (self.priorities[category], next(self._counter), category)
+
+    def _release(self, ticket):
+        with self._condition:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                self._condition.notify_all()
+
+    def acquire(self, method: str, url: str):
+        ticket = self._ticket(method, url)
+        with self._condition:
+            bisect.insort(self._waiters, ticket)
+            try:
+                while True:
+                    wait = self._try(ticket)
+                    if wait == 0:
+                        return
+                    self._condition.wait(wait)
+            finally:
+                self._release(ticket)
+
+    async def acquire_async(self, method: str, url: str):
+        import asyncio
+
+        ticket = self._ticket(method, url)
+        with self._condition:
+            bisect.insort(self._waiters, ticket)
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try(ticket)
+                if wait == 0:
+                    return
+                await asyncio.sleep(wait)
+        finally:
+            self._release(ticket)
+
+    def throttle(self, method: str, url: str, seconds: float = 1.0):
+        self.throttled += 1
+        category = classify(method, url)
+        now = time.time()
+        with self._condition, self.store.transaction() as state:
+            for bucket in ('global', category):
+                self._refill(state, bucket, now)
+                state[bucket][0] = -self.rates[bucket][0] * seconds
@@ -0,0 +1,193 @@
+import gzip
+import json
+import threading
+import time
+import urllib.parse
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+SENSITIVE_KEYS = ('username', 'password', 'session-token')
+
+
+def _redact(value):
+    if isinstance(value, dict):
+        return {k: "REDACTED" if k in SENSITIVE_KEYS else _redact(v)
+                for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _redact_content(content: bytes):
+    text = content.decode("utf-8")
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return text
+    return json.dumps(_redact(data), separators=(",", ":"))
+
+
+def _key(method: str, url: str, body=None):
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path.lstrip("/") + ("?" + parts.query if parts.query else "")
+    return (method.upper(), path,
+            json.dumps(body, sort_keys=True) if body is not None else None)
+
+
+class ReplayResponse:
+    def __init__(self, status_code: int, content: bytes, headers: dict = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class RecordingTransport:
+    def __init__(self, transport, path: str):
+        self.transport = transport
+        self.session = transport.session
+        self.path = path
+        self.file = _open(path, "w")
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+
+    def request(self, method, url, **kwargs):
+        r = self.transport.request(method, url, **kwargs)
+        method, path, body = _key(method, url, _redact(kwargs.get('json')))
+        record = {
+            't': round(time.monotonic() - self._start, 6),
+            'method': method,
+            'url': path,
+            'body': body,
+            'status': r.status_code,
+            'headers': {k: v for k, v in r.headers.items()
+                        if k.lower() in ('content-type', 'etag',
+                                         'last-modified')},
+            'response': _redact_content(r.content),
+        }
+        with self._lock:
+            self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        return r
+
+    def stats(self):
+        return self.transport.stats()
+
+    def close(self):
+        self.file.close()
+        self.transport.close()
+
+
+class ReplayTransport:
+    def __init__(self, path: str, timing: bool = False, speed: float = 1.0,
+                 strict: bool = False):
+        self.session = requests.Session()
+        self.timing = timing
+        self.speed = speed
+        self.strict = strict
+        self.records = defaultdict(deque)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._start = None
+        with _open(path, "r") as f:
+            for line in f:
+                record = json.loads(line)
+                self.records[(record['method'], record['url'],
+                              record['body'])].append(record)
+                if record['body'] is not None:
+                    self.records[(record['method'], record['url'],
+                                  None)].append(record)
+
+    def lookup(self, method, url, body=None):
+        key = _key(method, url, body)
+        with self._lock:
+            self.requests += 1
+            records = self.records.get(key) or self.records.get(key[:2]
+                                                                + (None,))
+            if not records:
+                if self.strict:
+                    raise KeyError(f"No recorded response for {key}")
+                return None
+            record = records[0]
+            if len(records) > 1:
+                records.rotate(-1)
+        return record
+
+    def request(self, method, url, **kwargs):
+        record = self.lookup(method, url, kwargs.get('json'))
+        if record is None:
+            body = {'errors': [{'messages': ["No recorded response."]}]}
+            return ReplayResponse(404, json.dumps(body).encode())
+        if self.timing:
+            if self._start is None:
+                self._start = time.monotonic() - record['t'] / self.speed
+            delay = self._start + record['t'] / self.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return ReplayResponse(record['status'],
+                              record['response'].encode("utf-8"),
+                              record['headers'])
+
+    def stats(self):
+        return {'requests': self.requests}
+
+    def close(self):
+        self.session.close()
+
+
+class FakeServer:
+    def __init__(self, path: str, host: str = "127.0.0.1", port: int = 0,
+                 **kwargs):
+        self.transport = ReplayTransport(path, **kwargs)
+        transport = self.transport
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = (json.loads(self.rfile.read(length)) if length
+                        else None)
+                r = transport.request(self.command, self.path, json=body)
+                self.send_response(r.status_code)
+                for key, value in r.headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(r.content)))
+                self.end_headers()
+                self.wfile.write(r.content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _reply
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self.server.server_port}/"
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join()
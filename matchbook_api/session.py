@@ -1,55 +1,162 @@
-import requests
 import logging
+import threading
+import time
+from functools import partial
+from typing import List
 
-from .utils import DEFAULT_HEADERS, check_http_status_code
+from .cache import ResponseCache
+from .coalesce import SingleFlight
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .utils import (DEFAULT_HEADERS, check_http_status_code, configure_logging,
+                    decode_body, normalize_url, retrieve_data)
 
 
 class Session:
-    def __init__(self, log: bool = True):
+    def __init__(self, log: bool = True, cache: ResponseCache = None,
+                 rate_limiter: RateLimiter = None, middleware: List = None,
+                 raw: bool = False, transport=None,
+                 metrics: Metrics = None,
+                 single_flight: SingleFlight = None):
         self.url = "https://api.matchbook.com/"
-        self.session = requests.Session()
+        self._transport = transport
+        self._transport_lock = threading.Lock()
         self.session_token = None
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.middleware = list(middleware or [])
+        self.raw = raw
+        self.context = threading.local()
+        self.metrics = metrics
+        self.single_flight = single_flight
+        self.log = log
         if log:
             self.session_logging_file = "session.log"
-            logging.basicConfig(filename=self.session_logging_file, level=logging.INFO)
+            configure_logging(self.session_logging_file)
 
-    def post(self, url, json, headers=DEFAULT_HEADERS):
-        r = self.session.post(self.url + url, json=json, headers=headers)
+    @property
+    def transport(self):
+        if self._transport is None:
+            with self._transport_lock:
+                if self._transport is None:
+                    from .transport import RequestsTransport
+
+                    self._transport = RequestsTransport()
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport):
+        self._transport = transport
+
+    @property
+    def session(self):
+        return self.transport.session
+
+    def _send(self, method, url, **kwargs):
+        call = self._transmit
+        for middleware in reversed(self.middleware):
+            call = partial(middleware, call_next=call)
+        return call(method, url, kwargs)
+
+    def _transmit(self, method, url, kwargs):
+        headers = getattr(self.context, 'headers', None)
+        if headers:
+            kwargs = kwargs | {'headers': kwargs['headers'] | headers}
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(method, url)
+        if self.metrics is None:
+            r = self.transport.request(method, self.url + url, **kwargs)
+        else:
+            start = time.perf_counter()
+            r = None
+            try:
+                r = self.transport.request(method, self.url + url, **kwargs)
+            finally:
+                end = time.perf_counter()
+                if r is None:
+                    self.metrics.observe(method, url, 0, start, end)
+                else:
+                    body = getattr(getattr(r, 'request', None), 'body', None)
+                    self.metrics.observe(method, url, r.status_code, start,
+                                         end, len(body or b""),
+                                         len(r.content))
+        if r.status_code == 429 and self.rate_limiter is not None:
+            self.rate_limiter.throttle(method, url)
+        return r
+
+    def post(self, url, json, headers=DEFAULT_HEADERS, raw=None):
+        r = self._send("POST", url, json=json, headers=headers)
         error = check_http_status_code(r)
         if isinstance(error, Exception):
             return error
         else:
-            logging.info("HTTP POST request returned 200 (success).")
-            data = r.json()
+            if self.log:
+                logging.info("HTTP POST request returned 200 (success).")
+            data = retrieve_data(r, self.raw if raw is None else raw)
             return data
 
-    def delete(self, url, headers=DEFAULT_HEADERS):
-        r = self.session.delete(self.url + url, headers=headers)
+    def delete(self, url, headers=DEFAULT_HEADERS, raw=None):
+        r = self._send("DELETE", url, headers=headers)
         error = check_http_status_code(r)
         if isinstance(error, Exception):
             return error
         else:
-            logging.info("HTTP DELETE request returned 200 (success).")
-            data = r.json()
+            if self.log:
+                logging.info("HTTP DELETE request returned 200 (success).")
+            data = retrieve_data(r, self.raw if raw is None else raw)
             return data
 
-    def get(self, url, headers=DEFAULT_HEADERS):
-        r = self.session.get(self.url + url, headers=headers)
+    def get(self, url, headers=DEFAULT_HEADERS, raw=None):
+        if self.cache is not None:
+            ttl = self.cache.ttl(url)
+            if ttl is not None:
+                return self._cached_get(url, headers, ttl,
+                                        self.raw if raw is None else raw)
+        if self.single_flight is None:
+            r = self._send("GET", url, headers=headers)
+        else:
+            context = getattr(self.context, 'headers', None) or {}
+            key = (id(self), normalize_url(url),
+                   tuple(sorted(context.items())))
+            r = self.single_flight.do(
+                key, partial(self._send, "GET", url, headers=headers),
+                lambda r: r.status_code == 200)
         error = check_http_status_code(r)
         if isinstance(error, Exception):
-            print(url)
             return error
         else:
-            logging.info("HTTP GET request returned 200 (success).")
-            data = r.json()
+            if self.log:
+                logging.info("HTTP GET request returned 200 (success).")
+            data = retrieve_data(r, self.raw if raw is None else raw)
             return data
 
-    def put(self, url, json, headers=DEFAULT_HEADERS):
-        r = self.session.put(self.url + url, json=json, headers=headers)
+    def put(self, url, json, headers=DEFAULT_HEADERS, raw=None):
+        r = self._send("PUT", url, json=json, headers=headers)
         error = check_http_status_code(r)
         if isinstance(error, Exception):
             return error
         else:
-            logging.info("HTTP PUT request returned 200 (success).")
-            data = r.json()
+            if self.log:
+                logging.info("HTTP PUT request returned 200 (success).")
+            data = retrieve_data(r, self.raw if raw is None else raw)
             return data
+
+    def _cached_get(self, url, headers, ttl, raw):
+        body, entry = self.cache.lookup(url)
+        if body is not None:
+            return decode_body(body, raw)
+        r = self._send("GET", url,
+                       headers=headers | self.cache.validators(entry))
+        if r.status_code == 304 and entry is not None:
+            if self.log:
+                logging.info("HTTP GET request returned 304 (not modified).")
+            return decode_body(self.cache.revalidated(url, entry, ttl), raw)
+        error = check_http_status_code(r)
+        if isinstance(error, Exception):
+            return error
+        else:
+            if self.log:
+                logging.info("HTTP GET request returned 200 (success).")
+            body = decode_body(r.content, raw=True)
+            self.cache.store(url, body, r.headers, ttl)
+            return decode_body(body, raw)
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, Set
+
+from .orderbook import MarketBook
+
+
+class MarketStreamer:
+    def __init__(self, client, callback: Callable = None, depth: int = 3,
+                 min_interval: float = 0.2, max_interval: float = 5.0,
+                 batch_size: int = 50, max_requests_per_second: float = 5.0):
+        self.client = client
+        self.callback = callback
+        self.depth = depth
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.batch_size = batch_size
+        self.max_requests_per_second = max_requests_per_second
+        self.interval = min_interval
+        self.books: Dict[int, MarketBook] = {}
+        self.watched: Dict[int, Set[int]] = {}
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.RLock()
+
+    def watch(self, event_id: int, market_id: int):
+        with self._lock:
+            self.watched.setdefault(event_id, set()).add(market_id)
+            self.books.setdefault(market_id,
+                                  MarketBook(market_id, self.depth))
+
+    def unwatch(self, event_id: int, market_id: int = None):
+        with self._lock:
+            market_ids = self.watched.get(event_id, set())
+            for watched_id in ([market_id] if market_id is not None
+                               else list(market_ids)):
+                market_ids.discard(watched_id)
+                self.books.pop(watched_id, None)
+            if not market_ids:
+                self.watched.pop(event_id, None)
+
+    def _batches(self):
+        with self._lock:
+            event_ids = list(self.watched)
+        for i in range(0, len(event_ids), self.batch_size):
+            batch = event_ids[i:i + self.batch_size]
+            yield {
+                'ids': ",".join(str(event_id) for event_id in batch),
+                'per_page': len(batch),
+                'states': "open,suspended",
+                'include_prices': True,
+                'price_depth': self.depth,
+            }
+
+    def _apply(self, data, updates):
+        if isinstance(data, Exception):
+            logging.warning(f"Market streamer poll failed: {data}")
+            return False
+        with self._lock:
+            for event in data.get('events', []):
+                market_ids = self.watched.get(event['id'], ())
+                for market in event.get('markets', []):
+                    book = self.books.get(market['id'])
+                    if market['id'] not in market_ids or book is None:
+                        continue
+                    changes = book.apply(market)
+                    if changes:
+                        updates[market['id']] = changes
+        return True
+
+    def _adjust_interval(self, updates, ok, requests):
+        floor = max(self.min_interval,
+                    requests / self.max_requests_per_second)
+        if not ok:
+            self.interval = self.max_interval
+        elif updates:
+            self.interval = max(floor, self.interval / 2)
+        else:
+            self.interval = max(floor, min(self.max_interval,
+                                           self.interval * 1.5))
+
+    def _updated_books(self, updates):
+        with self._lock:
+            books = {market_id: self.books.get(market_id)
+                     for market_id in updates}
+        return [(market_id, books[market_id], changes)
+                for market_id, changes in updates.items()
+                if books[market_id] is not None]
+
+    def _emit(self, updates):
+        if self.callback is not None:
+            for market_id, book, changes in self._updated_books(updates):
+                self.callback(market_id, book, changes)
+
+    def poll(self):
+        updates = {}
+        ok = True
+        requests = 0
+        for params in self._batches():
+            try:
+                data = self.client.get_events(**params)
+            except Exception as e:
+                data = e
+            ok &= self._apply(data, updates)
+            requests += 1
+        self._adjust_interval(updates, ok, requests)
+        self._emit(updates)
+        return updates
+
+    async def apoll(self):
+        batches = list(self._batches())
+        results = await asyncio.gather(
+            *(self.client.get_events(**params) for params in batches),
+            return_exceptions=True)
+        updates = {}
+        ok = True
+        for data in results:
+            ok &= self._apply(data, updates)
+        self._adjust_interval(updates, ok, len(batches))
+        self._emit(updates)
+        return updates
+
+    def __iter__(self):
+        while not self._stopped.is_set():
+            yield from self._updated_books(self.poll())
+            self._stopped.wait(self.interval)
+
+    async def __aiter__(self):
+        while not self._stopped.is_set():
+            for update in self._updated_books(await self.apoll()):
+                yield update
+            await asyncio.sleep(self.interval)
+
+    def run(self):
+        while not self._stopped.is_set():
+            self.poll()
+            self._stopped.wait(self.interval)
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
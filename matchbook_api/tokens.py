@@ -0,0 +1,46 @@
+import json
+import os
+import time
+
+
+DEFAULT_TOKEN_PATH = os.path.join("~", ".matchbook", "tokens.json")
+
+
+class TokenCache:
+    def __init__(self, path: str = DEFAULT_TOKEN_PATH,
+                 max_age: float = 5 * 3600):
+        self.path = os.path.expanduser(path)
+        self.max_age = max_age
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, tokens: dict):
+        os.makedirs(os.path.dirname(self.path) or ".", mode=0o700,
+                    exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(tokens, f)
+        os.replace(tmp, self.path)
+
+    def load(self, username: str):
+        entry = self._read().get(username)
+        if entry is None or time.time() - entry['saved-at'] > self.max_age:
+            return None
+        return entry
+
+    def save(self, username: str, session_token: str, user_id: int):
+        tokens = self._read()
+        tokens[username] = {'session-token': session_token,
+                            'user-id': user_id, 'saved-at': time.time()}
+        self._write(tokens)
+
+    def discard(self, username: str):
+        tokens = self._read()
+        if tokens.pop(username, None) is not None:
+            self._write(tokens)
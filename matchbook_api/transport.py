@@ -0,0 +1,114 @@
+import socket
+import threading
+from typing import Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+KEEPALIVE_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+] + [
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10),
+                        ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)
+]
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    def __init__(self, socket_options: list = None, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class RequestsTransport:
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10,
+                 timeout: Tuple[float, float] = (3.05, 30),
+                 keepalive: bool = True, adapter: HTTPAdapter = None):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.shared = adapter is not None
+        if adapter is None:
+            adapter = KeepAliveAdapter(
+                socket_options=KEEPALIVE_OPTIONS if keepalive else None,
+                pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.adapter = adapter
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def stats(self):
+        pools = self.adapter.poolmanager.pools
+        pools = [pools[key] for key in pools.keys()]
+        connections = sum(pool.num_connections for pool in pools)
+        requests_sent = sum(pool.num_requests for pool in pools)
+        return {
+            'connections': connections,
+            'requests': requests_sent,
+            'reused': requests_sent - connections,
+        }
+
+    def close(self):
+        if not self.shared:
+            self.session.close()
+
+
+class HTTPXTransport:
+    def __init__(self, pool_maxsize: int = 10,
+                 timeout: Tuple[float, float] = (3.05, 30),
+                 http2: bool = True):
+        import httpx
+
+        self.httpx = httpx
+        self.timeout = timeout
+        self.session = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(max_connections=pool_maxsize,
+                                max_keepalive_connections=pool_maxsize),
+            timeout=httpx.Timeout(timeout[1], connect=timeout[0]),
+            event_hooks={'response': [self._count]})
+        self.connections = 0
+        self.http_versions = {}
+        self._lock = threading.Lock()
+
+    def _count(self, response):
+        with self._lock:
+            self.http_versions[response.http_version] = (
+                self.http_versions.get(response.http_version, 0) + 1)
+
+    def _trace(self, event, info):
+        if event == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections += 1
+
+    def request(self, method, url, **kwargs):
+        kwargs['extensions'] = ({'trace': self._trace}
+                                | kwargs.get('extensions', {}))
+        try:
+            return self.session.request(method, url, **kwargs)
+        except self.httpx.TimeoutException as e:
+            raise requests.Timeout(e)
+        except self.httpx.TransportError as e:
+            raise requests.ConnectionError(e)
+
+    def stats(self):
+        with self._lock:
+            requests_sent = sum(self.http_versions.values())
+            return {
+                'connections': self.connections,
+                'requests': requests_sent,
+                'reused': requests_sent - self.connections,
+            }
+
+    def close(self):
+        self.session.close()
@@ -1,7 +1,20 @@
 from http.client import HTTPException
+import gzip
+import json
 import logging
+import threading
 import urllib.parse
 
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+        json_loads = msgspec.json.decode
+    except ImportError:
+        json_loads = json.loads
+
 
 DEFAULT_HEADERS = {
     "accept": "application/json",
@@ -9,18 +22,43 @@ DEFAULT_HEADERS = {
     "Accept-Encoding": "gzip"
 }
 
+GZIP_MAGIC = b"\x1f\x8b"
+
+LOG_FORMAT = "%(asctime)s %(threadName)s %(levelname)s %(message)s"
+
+_logging_lock = threading.Lock()
+_logging_configured = False
+
+
+def configure_logging(filename):
+    global _logging_configured
+    with _logging_lock:
+        if not _logging_configured:
+            logging.basicConfig(filename=filename, level=logging.INFO,
+                                format=LOG_FORMAT)
+            _logging_configured = True
+
+
 def check_http_status_code(r):
     if r.status_code != 200:
-        print(r.json())
-        logging.error(f"HTTP error {r.status_code}: "
-                      f"{r.json()['errors'][0]['messages']}")
-        return HTTPException(f"HTTP error {r.status_code}: "
-                             f"{r.json()['errors'][0]['messages']}")
+        return http_error(r.status_code, retrieve_data(r))
 
 
-def retrieve_data(r):
-    if "Content-Encoding" in r.headers.keys() and r.headers["Content-Encoding"] == "gzip":
-        pass
+def http_error(status_code, data):
+    logging.error(f"HTTP error {status_code}: "
+                  f"{data['errors'][0]['messages']}")
+    return HTTPException(f"HTTP error {status_code}: "
+                         f"{data['errors'][0]['messages']}")
+
+
+def decode_body(body: bytes, raw: bool = False):
+    if body[:2] == GZIP_MAGIC:
+        body = gzip.decompress(body)
+    return body if raw else json_loads(body)
+
+
+def retrieve_data(r, raw: bool = False):
+    return decode_body(r.content, raw)
 
 
 def add_kwargs_to_url(url, **kwargs):
@@ -34,6 +72,14 @@ def add_kwargs_to_url(url, **kwargs):
     return url[:-1]
 
 
+def normalize_url(url):
+    path, _, query = url.partition("?")
+    if not query:
+        return path
+    return path + "?" + "&".join(sorted(part for part in query.split("&")
+                                        if part))
+
+
 def create_kwarg_dict(**kwargs):
     kwarg_dict = {}
     for k, v in kwargs.items():
@@ -0,0 +1,47 @@
+import json
+import threading
+import time
+
+import pytest
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.content = json.dumps(data).encode()
+        self.headers = headers or {}
+
+    def json(self):
+        return self._data
+
+
+class FakeHTTP:
+    def __init__(self, responses=(), delay=0.0):
+        self.responses = (responses if callable(responses)
+                          else list(responses))
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, headers=None, **kwargs):
+        with self.lock:
+            self.requests.append((method, url, headers))
+            if callable(self.responses):
+                response = self.responses(method, url, headers)
+            else:
+                response = self.responses.pop(0)
+        time.sleep(self.delay)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def fake_response():
+    return FakeResponse
+
+
+@pytest.fixture
+def fake_http():
+    return FakeHTTP
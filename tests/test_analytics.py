@@ -0,0 +1,81 @@
+import numpy as np
+
+from matchbook_api import MarketArrays
+from matchbook_api.analytics import convert_odds, from_decimal, to_decimal
+
+
+def price(side, odds, amount=10.0):
+    return {'side': side, 'odds': odds, 'available-amount': amount}
+
+
+def runner(runner_id, back=(), lay=()):
+    return {'id': runner_id,
+            'prices': ([price('back', odds) for odds in back]
+                       + [price('lay', odds) for odds in lay])}
+
+
+def events():
+    return [
+        {'id': 1, 'markets': [
+            {'id': 11, 'runners': [runner(1, [1.9, 2.0], [2.1]),
+                                   runner(2, [1.9], [2.0, 2.2])]},
+            {'id': 12, 'runners': [runner(3, [2.2], [2.3]),
+                                   runner(4, [2.1], [2.2])]},
+        ]},
+        {'id': 2, 'markets': [
+            {'id': 21, 'runners': [runner(5, [], [1.4]),
+                                   runner(6, [2.5], [3.0])]},
+            {'id': 22, 'runners': []},
+        ]},
+    ]
+
+
+def test_odds_conversion_round_trips():
+    decimal = np.array([1.25, 1.5, 2.0, 3.0, 5.0])
+    for odds_type in ('US', 'HK', 'MALAY', 'INDO', '%'):
+        converted = from_decimal(decimal, odds_type)
+        assert np.allclose(to_decimal(converted, odds_type), decimal)
+    assert np.allclose(from_decimal([1.5, 2.5], 'US'), [-200, 150])
+    assert np.allclose(convert_odds([-200, 150], 'US', 'HK'), [0.5, 1.5])
+
+
+def test_arrays_are_sorted_by_best_price():
+    arrays = MarketArrays.from_events(events(), depth=2)
+    assert list(arrays.market_ids) == [11, 12, 21]
+    assert list(arrays.event_ids) == [1, 1, 2]
+    assert list(arrays.runner_market) == [0, 0, 1, 1, 2, 2]
+    assert list(arrays.back_odds[0]) == [2.0, 1.9]
+    assert list(arrays.lay_odds[1]) == [2.0, 2.2]
+    assert np.isnan(arrays.best_back[4])
+    assert np.allclose(arrays.weighted_odds('back')[:2], [1.95, 1.9])
+
+
+def test_book_percentage_fair_odds_and_arbitrage():
+    arrays = MarketArrays.from_events(events())
+    book = arrays.book_percentage('back')
+    assert np.isclose(book[0], 100 / 2.0 + 100 / 1.9)
+    assert np.isnan(book[2])
+    fair = arrays.fair_odds()
+    assert np.isclose((1 / fair[:2]).sum(), 1)
+    assert np.allclose(arrays.spread()[:2], [0.1, 0.1])
+    result = arrays.arbitrage()
+    assert list(result['back']) == [12]
+    assert list(result['lay']) == [21]
+    assert list(arrays.arbitrage(commission=0.2)['back']) == []
+
+
+def test_empty_card():
+    arrays = MarketArrays.from_events([])
+    assert len(arrays) == 0
+    assert arrays.book_percentage().shape == (0,)
+
+
+def test_decimal_odds_are_not_converted_twice():
+    markets = [{'id': 1, 'runners': [
+        {'id': 1, 'prices': [{'side': 'back', 'odds': 150,
+                              'decimal-odds': 2.5, 'available-amount': 5}]},
+        {'id': 2, 'prices': [{'side': 'back', 'odds': -200,
+                              'available-amount': 5}]},
+    ]}]
+    arrays = MarketArrays.from_markets(markets, odds_type='US')
+    assert np.allclose(arrays.best_back, [2.5, 1.5])
@@ -0,0 +1,81 @@
+import asyncio
+
+from aiohttp import web
+
+from matchbook_api import AsyncClient
+
+
+async def markets(request):
+    event_id = int(request.match_info['event_id'])
+    return web.json_response({'markets': [{'id': event_id * 10}]})
+
+
+async def serve_and_fetch(event_ids, max_in_flight):
+    app = web.Application()
+    app.router.add_get('/edge/rest/events/{event_id}/markets', markets)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        async with AsyncClient(log=False) as client:
+            client.session.url = f"http://127.0.0.1:{port}/"
+            return await client.get_markets_for_events(
+                event_ids, max_in_flight=max_in_flight)
+    finally:
+        await runner.cleanup()
+
+
+def test_get_markets_for_events():
+    result = asyncio.run(serve_and_fetch([1, 2, 3], 2))
+    assert list(result.keys()) == [1, 2, 3]
+    assert result[2]['markets'][0]['id'] == 20
+
+
+async def serve_flaky_session():
+    state = {'logins': 0, 'balance_calls': 0, 'headers': []}
+
+    async def login(request):
+        state['logins'] += 1
+        return web.json_response({'session-token': str(state['logins']),
+                                  'user-id': 1})
+
+    async def balance(request):
+        state['balance_calls'] += 1
+        state['headers'].append(request.headers.get('X-Request-Id'))
+        if state['balance_calls'] == 1:
+            return web.json_response({'errors': [{'messages': ["x"]}]},
+                                     status=503)
+        if state['logins'] < 2:
+            return web.json_response({'errors': [{'messages': ["x"]}]},
+                                     status=401)
+        return web.json_response({'balance': 100})
+
+    app = web.Application()
+    app.router.add_post('/bpapi/rest/security/session', login)
+    app.router.add_get('/edge/rest/account/balance', balance)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        async with AsyncClient(log=False) as client:
+            client.session.url = f"http://127.0.0.1:{port}/"
+            client.session.middleware[1].backoff = 0
+            await client.login()
+            with client.request_context(**{'X-Request-Id': 'abc'}):
+                result = await client.get_balance()
+            mapped = await client.map(client.get_balance, [(), ()])
+            return result, mapped, state
+    finally:
+        await runner.cleanup()
+
+
+def test_retry_relogin_context_and_map():
+    result, mapped, state = asyncio.run(serve_flaky_session())
+    assert result == {'balance': 100}
+    assert mapped == [{'balance': 100}] * 2
+    assert state['logins'] == 2
+    assert state['headers'][:3] == ['abc'] * 3
@@ -0,0 +1,57 @@
+import asyncio
+from http.client import HTTPException
+
+import requests
+
+from matchbook_api import AsyncClient, Client
+
+
+class FakeSession:
+    def __init__(self):
+        self.payloads = []
+
+    def post(self, url, json, headers=None):
+        self.payloads.append(json)
+        if json['offers'][0]['runner-id'] == 99:
+            return HTTPException("HTTP error 400")
+        if json['offers'][0]['runner-id'] == 98:
+            raise requests.ConnectionError("connection reset")
+        return {'offers': [
+            {'runner-id': offer['runner-id'],
+             'status': 'failed' if offer['stake'] < 0 else 'open'}
+            for offer in json['offers']]}
+
+
+def test_submit_offers_bulk_chunks_and_merges():
+    client = Client(log=False)
+    client.session = FakeSession()
+    offers = [{'runner-id': i, 'stake': -1 if i == 3 else 5}
+              for i in range(10)] + [{'runner-id': 99, 'stake': 5}]
+    result = client.submit_offers_bulk(offers, chunk_size=5)
+    assert len(client.session.payloads) == 3
+    assert [o['runner-id'] for o in result['offers']] == list(range(10))
+    assert [o['runner-id'] for o in result['failed']] == [3]
+    assert result['errors'][0]['offers'] == [{'runner-id': 99, 'stake': 5}]
+
+
+def test_raised_chunk_errors_keep_placed_results():
+    offers = [{'runner-id': i, 'stake': 5} for i in range(5)]
+    offers += [{'runner-id': 98, 'stake': 5}]
+    client = Client(log=False)
+    client.session = FakeSession()
+    result = client.submit_offers_bulk(offers, chunk_size=5)
+    assert len(result['offers']) == 5
+    assert isinstance(result['errors'][0]['error'], requests.ConnectionError)
+
+    async def submit():
+        async_client = AsyncClient(log=False)
+
+        async def submit_offers(chunk, odds_type, exchange_type):
+            return FakeSession().post(None, {'offers': chunk})
+
+        async_client.submit_offers = submit_offers
+        return await async_client.submit_offers_bulk(offers, chunk_size=5)
+
+    result = asyncio.run(submit())
+    assert len(result['offers']) == 5
+    assert isinstance(result['errors'][0]['error'], requests.ConnectionError)
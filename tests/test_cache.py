@@ -0,0 +1,35 @@
+from matchbook_api import DiskCache, ResponseCache
+from matchbook_api.session import Session
+
+
+def test_cached_get_hits_and_revalidates(tmp_path, fake_http,
+                                        fake_response):
+    cache = ResponseCache(DiskCache(str(tmp_path / "cache.sqlite")),
+                          ttls={"bpapi/rest/lookups/currencies": 0})
+    session = Session(log=False, cache=cache)
+    session.transport = fake_http([
+        fake_response(200, ['GBP'], {'ETag': '"v1"'}),
+        fake_response(304),
+    ])
+    assert session.get("bpapi/rest/lookups/currencies") == ['GBP']
+    assert session.get("bpapi/rest/lookups/currencies") == ['GBP']
+    assert session.transport.requests[1][2]['If-None-Match'] == '"v1"'
+    assert (cache.misses, cache.revalidations) == (1, 1)
+
+
+def test_memory_cache_serves_fresh_entries(fake_http, fake_response):
+    session = Session(log=False, cache=ResponseCache())
+    session.transport = fake_http([fake_response(200, {'sports': []})])
+    for _ in range(3):
+        assert session.get("edge/rest/lookups/sports?offset=0") == {
+            'sports': []}
+    assert (session.cache.hits, session.cache.misses) == (2, 1)
+
+
+def test_cached_entries_are_copied_and_honour_raw(fake_http, fake_response):
+    session = Session(log=False, cache=ResponseCache())
+    session.transport = fake_http([fake_response(200, {'sports': []})])
+    url = "edge/rest/lookups/sports?offset=0"
+    session.get(url)['sports'].append('mutated')
+    assert session.get(url) == {'sports': []}
+    assert session.get(url, raw=True) == b'{"sports": []}'
@@ -0,0 +1,101 @@
+from matchbook_api import Catalogue
+
+
+class FakeClient:
+    def __init__(self, events, markets):
+        self.events = events
+        self.markets = markets
+        self.market_calls = []
+
+    def iter_events(self, **kwargs):
+        return iter([dict(event) for event in self.events])
+
+    def iter_markets(self, event_id, **kwargs):
+        self.market_calls.append(event_id)
+        return iter(self.markets[event_id])
+
+    def map(self, method, args_list, max_workers=10, **kwargs):
+        return [method(args) for args in args_list]
+
+
+def event(event_id, sport_id, start, tags=(), status="open"):
+    return {'id': event_id, 'name': f"Event {event_id}", 'sport-id': sport_id,
+            'start': start, 'status': status,
+            'meta-tags': [{'url-name': tag, 'type': 'COMPETITION'}
+                          for tag in tags]}
+
+
+def market(market_id, market_type="one_x_two"):
+    return {'id': market_id, 'name': f"Market {market_id}",
+            'status': 'open', 'market-type': market_type,
+            'runners': [{'id': market_id * 10 + i, 'name': str(i),
+                         'status': 'open'} for i in range(3)]}
+
+
+def make_client():
+    return FakeClient(
+        [event(1, 15, "2026-01-01T12:00:00Z", ["premier-league"]),
+         event(2, 15, "2026-01-02T12:00:00Z", ["la-liga"]),
+         event(3, 24, "2026-01-01T18:00:00Z")],
+        {1: [market(11), market(12, "total")], 2: [market(21)],
+         3: [market(31)]})
+
+
+def test_filtered_queries():
+    catalogue = Catalogue(make_client())
+    assert catalogue.refresh() == {'changed': 3, 'closed': 0}
+    assert [e['id'] for e in catalogue.events(sport_id=15)] == [1, 2]
+    assert [e['id'] for e in catalogue.events(tag="la-liga")] == [2]
+    assert [e['id'] for e in catalogue.events(
+        start_before="2026-01-02")] == [1, 3]
+    assert [m['id'] for m in catalogue.markets(
+        sport_id=15, market_type="one_x_two")] == [11, 21]
+    assert [r['id'] for r in catalogue.runners(12)] == [120, 121, 122]
+    assert catalogue.event(3)['sport_id'] == 24
+
+
+def test_incremental_refresh_only_fetches_changed_events():
+    client = make_client()
+    catalogue = Catalogue(client)
+    catalogue.refresh()
+    client.market_calls.clear()
+    assert catalogue.refresh() == {'changed': 0, 'closed': 0}
+    assert client.market_calls == []
+
+    client.events[0]['status'] = 'suspended'
+    del client.events[2]
+    assert catalogue.refresh() == {'changed': 1, 'closed': 1}
+    assert client.market_calls == [1]
+    assert catalogue.event(1)['status'] == 'suspended'
+    assert catalogue.markets(event_id=3)[0]['status'] == 'closed'
+    assert catalogue.refresh() == {'changed': 0, 'closed': 0}
+
+
+def test_persistence_starts_warm(tmp_path):
+    path = str(tmp_path / "catalogue.db")
+    catalogue = Catalogue(make_client(), path)
+    catalogue.refresh()
+    catalogue.close()
+
+    client = make_client()
+    catalogue = Catalogue(client, path)
+    assert len(catalogue.events()) == 3
+    assert catalogue.refresh() == {'changed': 0, 'closed': 0}
+    assert client.market_calls == []
+
+
+def test_refresh_picks_up_markets_added_to_unchanged_events():
+    client = make_client()
+    client.events[0]['markets'] = [market(11)]
+    catalogue = Catalogue(client)
+    catalogue.refresh()
+    client.events[0]['markets'].append(market(13))
+    assert catalogue.refresh() == {'changed': 1, 'closed': 0}
+    assert [m['id'] for m in catalogue.markets(event_id=1)] == [11, 13]
+
+    client = make_client()
+    catalogue = Catalogue(client, market_ttl=0)
+    catalogue.refresh()
+    client.markets[2].append(market(22))
+    catalogue.refresh()
+    assert [m['id'] for m in catalogue.markets(event_id=2)] == [21, 22]
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+
+from matchbook_api import AsyncClient, Client, SingleFlight
+from matchbook_api.utils import normalize_url
+
+
+def slow_http(fake_http, fake_response, status_code=200, delay=0.05):
+    def respond(method, url, headers):
+        if status_code != 200:
+            return fake_response(status_code,
+                                 {'errors': [{'messages': ["Error."]}]})
+        return fake_response(200, {'id': len(http.requests)})
+
+    http = fake_http(respond, delay=delay)
+    return http
+
+
+def concurrent_gets(client, n=8):
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def run(i):
+        barrier.wait()
+        results[i] = client.get_event(1)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_reads_share_one_request(fake_http, fake_response):
+    single_flight = SingleFlight()
+    client = Client(log=False, single_flight=single_flight)
+    client.session.transport = slow_http(fake_http, fake_response)
+    results = concurrent_gets(client)
+    assert len(client.session.transport.requests) == 1
+    assert results == [{'id': 1}] * 8
+    assert results[0] is not results[1]
+    assert single_flight.coalesced == 7
+    client.get_event(1)
+    assert len(client.session.transport.requests) == 2
+
+
+def test_micro_ttl_serves_duplicates_but_not_errors(fake_http,
+                                                    fake_response):
+    client = Client(log=False, single_flight=SingleFlight(ttl=0.05))
+    client.session.transport = slow_http(fake_http, fake_response,
+                                         delay=0)
+    assert client.get_event(1) == client.get_event(1) == {'id': 1}
+    time.sleep(0.06)
+    assert client.get_event(1) == {'id': 2}
+
+    client.session.transport = slow_http(fake_http, fake_response,
+                                         status_code=500, delay=0)
+    client.session.middleware = []
+    client.get_event(2)
+    client.get_event(2)
+    assert len(client.session.transport.requests) == 2
+
+
+def test_normalize_url():
+    assert normalize_url("a/b?y=2&x=1") == normalize_url("a/b?x=1&y=2")
+    assert normalize_url("a/b") == "a/b"
+
+
+def test_async_coalescing():
+    calls = []
+
+    async def fetch(method, url, json=None, headers=None):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return 200, b'{"id": 1}'
+
+    async def run():
+        client = AsyncClient(log=False, single_flight=SingleFlight())
+        client.session._fetch = fetch
+        return await asyncio.gather(*(client.get_event(1) for _ in range(5)))
+
+    assert asyncio.run(run()) == [{'id': 1}] * 5
+    assert len(calls) == 1
+
+
+def test_shared_instance_does_not_mix_sessions(fake_http, fake_response):
+    single_flight = SingleFlight(ttl=1.0)
+    clients = [Client(log=False, single_flight=single_flight)
+               for _ in range(2)]
+    for client in clients:
+        client.session.transport = slow_http(fake_http, fake_response,
+                                             delay=0)
+    clients[0].get_event(1)
+    clients[1].get_event(1)
+    with clients[1].request_context(**{'X-Account': 'b'}):
+        clients[1].get_event(1)
+    assert len(clients[0].session.transport.requests) == 1
+    assert len(clients[1].session.transport.requests) == 2
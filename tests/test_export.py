@@ -0,0 +1,85 @@
+import csv
+
+import pytest
+
+from matchbook_api import ReportExporter
+
+
+class FakeClient:
+    def __init__(self, bets):
+        self.bets = bets
+        self.calls = []
+
+    def iter_settled_bets(self, per_page, **kwargs):
+        self.calls.append(kwargs)
+        after = kwargs.get('after')
+        return iter([bet for bet in self.bets
+                     if after is None or bet['settled-at'] >= after])
+
+
+def bet(bet_id, settled_at):
+    return {'id': bet_id, 'settled-at': settled_at, 'stake': 5,
+            'runner': {'id': 1, 'name': 'A'}}
+
+
+def test_incremental_csv_sync(tmp_path):
+    client = FakeClient([bet(1, "2026-01-01"), bet(2, "2026-01-02"),
+                         bet(3, "2026-01-02")])
+    exporter = ReportExporter(client, str(tmp_path), chunk_size=2)
+    assert exporter.sync('settled_bets') == 3
+    client.bets.append(bet(4, "2026-01-03"))
+    assert exporter.sync('settled_bets') == 1
+    assert client.calls[1] == {'after': "2026-01-02"}
+    with open(tmp_path / "settled_bets.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row['id'] for row in rows] == ['1', '2', '3', '4']
+    assert rows[0]['runner.name'] == 'A'
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_sync_widens_header_for_new_columns(tmp_path):
+    client = FakeClient([bet(1, "2026-01-01"),
+                         dict(bet(2, "2026-01-02"), commission=0.1)])
+    exporter = ReportExporter(client, str(tmp_path), chunk_size=1)
+    assert exporter.sync('settled_bets') == 2
+    client.bets.append(dict(bet(3, "2026-01-03"), profit=2))
+    assert exporter.sync('settled_bets') == 1
+    rows = read_csv(tmp_path / "settled_bets.csv")
+    assert [row['id'] for row in rows] == ['1', '2', '3']
+    assert [row['commission'] for row in rows] == ['', '0.1', '']
+    assert [row['profit'] for row in rows] == ['', '', '2']
+
+
+class FailingClient(FakeClient):
+    def __init__(self, bets):
+        super().__init__(bets)
+        self.fail = False
+
+    def iter_settled_bets(self, per_page, **kwargs):
+        yield from super().iter_settled_bets(per_page, **kwargs)
+        if self.fail:
+            raise ConnectionError("connection reset")
+
+
+def test_failed_sync_leaves_no_rows(tmp_path):
+    client = FailingClient([bet(1, "2026-01-01")])
+    exporter = ReportExporter(client, str(tmp_path), chunk_size=1)
+    exporter.sync('settled_bets')
+    state = exporter.load_state()
+    client.bets += [bet(2, "2026-01-02"), bet(3, "2026-01-03")]
+    client.fail = True
+    with pytest.raises(ConnectionError):
+        exporter.sync('settled_bets')
+    assert [row['id'] for row in read_csv(
+        tmp_path / "settled_bets.csv")] == ['1']
+    assert exporter.load_state() == state
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'export_state.json', 'settled_bets.csv']
+    client.fail = False
+    assert exporter.sync('settled_bets') == 2
+    assert [row['id'] for row in read_csv(
+        tmp_path / "settled_bets.csv")] == ['1', '2', '3']
@@ -0,0 +1,46 @@
+import time
+
+from matchbook_api import Client, HeartbeatKeeper
+
+
+def heartbeat_http(fake_http, fake_response, delay=0.0):
+    return fake_http(
+        lambda method, url, headers: fake_response(200, {'actual-timeout': 1}),
+        delay=delay)
+
+
+def test_keeper_renews_and_releases(fake_http, fake_response):
+    client = Client(log=False)
+    keeper = HeartbeatKeeper(client, timeout=1, fraction=0.05)
+    keeper.session.transport = heartbeat_http(fake_http, fake_response)
+    with keeper:
+        time.sleep(0.3)
+    assert keeper.beats >= 3
+    assert keeper.session.transport.requests[-1][0] == "DELETE"
+
+
+def test_keeper_reports_late_beats(fake_http, fake_response):
+    client = Client(log=False)
+    delays = []
+    keeper = HeartbeatKeeper(client, timeout=1, fraction=0.01,
+                             on_late=delays.append, late_threshold=0.02)
+    keeper.session.transport = heartbeat_http(fake_http, fake_response,
+                                              delay=0.05)
+    keeper.beat()
+    keeper.beat()
+    assert keeper.late == 1 and delays[0] > 0.02
+
+
+def test_keeper_sends_token_and_logs_in_again(fake_http, fake_response):
+    client = Client(log=False)
+    client.session_token = 'a'
+    client.session.transport = fake_http(
+        [fake_response(200, {'session-token': 'b', 'user-id': 1})])
+    keeper = HeartbeatKeeper(client, timeout=1)
+    keeper.session.transport = fake_http([
+        fake_response(401, {'errors': [{'messages': ['expired']}]}),
+        fake_response(200, {'actual-timeout': 1})])
+    assert keeper.beat() == {'actual-timeout': 1}
+    assert keeper.missed == 0 and client.session_token == 'b'
+    assert [headers['session-token'] for _, _, headers
+            in keeper.session.transport.requests] == ['a', 'b']
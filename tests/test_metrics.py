@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+import requests
+
+from matchbook_api import Client, Metrics, RetryMiddleware
+from matchbook_api.metrics import endpoint_name
+
+
+def test_endpoint_name():
+    assert endpoint_name("GET", "edge/rest/events/123/markets/45?x=1") == (
+        "GET edge/rest/events/{id}/markets/{id}")
+
+
+def test_request_metrics_and_hooks(fake_http, fake_response):
+    metrics = Metrics()
+    events = []
+    metrics.add_hook(events.append)
+    client = Client(log=False, relogin=False, metrics=metrics,
+                    middleware=[RetryMiddleware(backoff=0, metrics=metrics)])
+    error = {'errors': [{'messages': ['slow down']}]}
+    client.session.transport = fake_http([
+        fake_response(429, error), fake_response(200, {'id': 1})])
+    assert client.get_runner(1, 2, 3) == {'id': 1}
+    stats = metrics.snapshot()[
+        "GET edge/rest/events/{id}/markets/{id}/runners/{id}"]
+    assert stats['requests'] == 2
+    assert stats['rate_limited'] == stats['errors_4xx'] == 1
+    assert stats['retries'] == 1
+    assert [event['status'] for event in events] == [429, 200]
+    assert 'matchbook_requests_total' in metrics.prometheus()
+
+
+def test_failed_requests_are_recorded(fake_http):
+    metrics = Metrics()
+    client = Client(log=False, relogin=False, metrics=metrics,
+                    middleware=[])
+    client.session.transport = fake_http(
+        [requests.ConnectionError("connection refused")])
+    with pytest.raises(requests.ConnectionError):
+        client.get_balance()
+    stats = metrics.snapshot()["GET edge/rest/account/balance"]
+    assert stats['requests'] == stats['failures'] == 1
+    assert 'matchbook_failures_total' in metrics.prometheus()
+
+
+def test_async_session_metrics():
+    from aiohttp import web
+
+    from matchbook_api import AsyncClient
+
+    async def balance(request):
+        return web.json_response({'balance': 1})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/edge/rest/account/balance', balance)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with AsyncClient(log=False, metrics=metrics) as client:
+                client.session.url = f"http://127.0.0.1:{port}/"
+                await client.get_balance()
+        finally:
+            await runner.cleanup()
+
+    metrics = Metrics()
+    asyncio.run(run())
+    stats = metrics.snapshot()["GET edge/rest/account/balance"]
+    assert stats['requests'] == 1 and stats['bytes_received'] > 0
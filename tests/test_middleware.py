@@ -0,0 +1,35 @@
+import requests
+
+from matchbook_api import Client, RetryMiddleware
+
+
+ERROR = {'errors': [{'messages': ['error']}]}
+
+
+def test_retry_transient_errors(fake_http, fake_response):
+    client = Client(log=False, relogin=False,
+                    middleware=[RetryMiddleware(backoff=0)])
+    client.session.transport = fake_http([
+        requests.ConnectionError(), fake_response(503, ERROR),
+        fake_response(200, {'balance': 1})])
+    assert client.get_balance() == {'balance': 1}
+    assert len(client.session.transport.requests) == 3
+
+
+def test_post_is_not_retried(fake_http, fake_response):
+    client = Client(log=False, relogin=False,
+                    middleware=[RetryMiddleware(backoff=0)])
+    client.session.transport = fake_http([fake_response(503, ERROR)])
+    assert isinstance(client.submit_offers([]), Exception)
+
+
+def test_relogin_on_expired_session(fake_http, fake_response):
+    client = Client("user", "pass", log=False)
+    client.session.transport = fake_http([
+        fake_response(200, {'session-token': 'a', 'user-id': 1}),
+        fake_response(401, ERROR),
+        fake_response(200, {'session-token': 'b', 'user-id': 1}),
+        fake_response(200, {'balance': 1})])
+    client.login()
+    assert client.get_balance() == {'balance': 1}
+    assert client.session_token == 'b'
@@ -0,0 +1,69 @@
+from matchbook_api import (Client, Event, Market, MarketBook,
+                           MarketStreamer, Offer, PositionLedger)
+
+
+EVENT = {
+    'id': 1, 'name': 'A v B', 'sport-id': 15, 'status': 'open',
+    'markets': [{'id': 11, 'name': 'Match Odds', 'runners': [
+        {'id': 111, 'name': 'A', 'prices': [
+            {'side': 'back', 'odds': 2.0, 'available-amount': 10.0}]}]}],
+}
+
+
+def test_lazy_nested_parsing():
+    event = Event(EVENT)
+    assert event.sport_id == 15
+    assert isinstance(event._markets, list)
+    runner = event.markets[0].runners[0]
+    assert isinstance(event._markets, tuple)
+    assert runner.prices[0].available_amount == 10.0
+    assert runner['prices'][0]['available-amount'] == 10.0
+    assert not hasattr(event, '__dict__')
+    assert event.to_dict()['markets'][0]['runners'][0]['id'] == 111
+
+
+def test_unknown_fields_are_kept():
+    event = Event(dict(EVENT, **{'meta-tags': [{'name': 'EPL'}]}))
+    assert event['meta-tags'] == [{'name': 'EPL'}]
+    assert event.get('meta-tags') == [{'name': 'EPL'}]
+    assert 'meta-tags' in event and 'meta-tags' in event.keys()
+    assert event.to_dict()['meta-tags'] == [{'name': 'EPL'}]
+    assert event.get('missing', 0) == 0
+
+
+class FakeSession:
+    def get(self, url):
+        return {'total': 1, 'events': [EVENT]}
+
+
+def test_client_models_flag():
+    client = Client(log=False, models=True)
+    client.session = FakeSession()
+    assert client.get_events()['events'][0].markets[0].id == 11
+    client.models = False
+    assert client.get_events()['events'][0] is EVENT
+
+
+def test_models_work_with_dict_consumers():
+    market = Market(EVENT['markets'][0])
+    assert 'runners' in market and 'id' in market
+    assert 'volume' not in market and 0 not in market
+    assert dict(market)['id'] == 11
+    book = MarketBook(11)
+    assert list(book.apply(market)) == [111]
+    assert book[111].back.best == 2.0
+
+    ledger = PositionLedger()
+    ledger.apply(Offer({'id': 5, 'market-id': 11, 'runner-id': 111,
+                        'side': 'back', 'odds': 2.0, 'remaining': 0,
+                        'status': 'matched', 'matched-bets': [
+                            {'id': 50, 'odds': 2.0, 'stake': 10}]}))
+    assert ledger.markets[11].runner_pnl() == {111: 10.0}
+
+
+def test_streamer_with_models_client():
+    client = Client(log=False, models=True)
+    client.session = FakeSession()
+    streamer = MarketStreamer(client)
+    streamer.watch(1, 11)
+    assert list(streamer.poll()) == [11]
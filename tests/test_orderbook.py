@@ -0,0 +1,27 @@
+from matchbook_api import MarketBook
+
+
+def runner(runner_id, back, lay):
+    prices = ([{'side': 'back', 'odds': o, 'available-amount': a}
+               for o, a in back]
+              + [{'side': 'lay', 'odds': o, 'available-amount': a}
+                 for o, a in lay])
+    return {'id': runner_id, 'prices': prices}
+
+
+def test_apply_and_diff():
+    book = MarketBook(1, depth=3)
+    changes = book.apply({'runners': [
+        runner(10, [(2.0, 50), (2.1, 100)], [(2.2, 20)])]})
+    assert list(changes[10]['back']) == [0, 1]
+    assert book[10].back.best == 2.1
+    assert book[10].lay.best == 2.2
+    assert book[10].back.total == 150
+    assert abs(book[10].back.weighted_odds - 310 / 150) < 1e-9
+
+    changes = book.apply({'runners': [
+        runner(10, [(2.0, 75), (2.1, 100)], [(2.2, 20)])]})
+    assert list(changes[10]['back']) == [1]
+    assert 'lay' not in changes[10]
+    assert book.apply({'runners': [
+        runner(10, [(2.0, 75), (2.1, 100)], [(2.2, 20)])]}) == {}
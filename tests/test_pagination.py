@@ -0,0 +1,41 @@
+from matchbook_api.pagination import iter_records
+
+
+def fake_fetch(total, max_per_page=None, with_total=True):
+    calls = []
+
+    def fetch(offset, per_page, **kwargs):
+        calls.append(offset)
+        per_page = min(per_page, max_per_page or per_page)
+        records = list(range(offset, min(offset + per_page, total)))
+        page = {'offset': offset, 'per-page': per_page, 'bets': records}
+        if with_total:
+            page['total'] = total
+        return page
+
+    return fetch, calls
+
+
+def test_iter_records_all_pages():
+    fetch, calls = fake_fetch(25)
+    assert list(iter_records(fetch, 'bets', per_page=10)) == list(range(25))
+    assert calls == [0, 10, 20]
+
+
+def test_iter_records_without_prefetch():
+    fetch, calls = fake_fetch(20)
+    assert list(iter_records(fetch, 'bets', per_page=10,
+                             prefetch=False)) == list(range(20))
+    assert calls == [0, 10]
+
+
+def test_iter_records_follows_total_when_page_size_is_capped():
+    fetch, calls = fake_fetch(10, max_per_page=4)
+    assert list(iter_records(fetch, 'bets', per_page=10)) == list(range(10))
+    assert calls == [0, 4, 8]
+
+
+def test_iter_records_without_total_stops_on_short_page():
+    fetch, calls = fake_fetch(25, with_total=False)
+    assert list(iter_records(fetch, 'bets', per_page=10)) == list(range(25))
+    assert calls == [0, 10, 20]
@@ -0,0 +1,60 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from matchbook_api import ClientPool
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, body, headers=()):
+        body = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        username = json.loads(self.rfile.read(length))['username']
+        token = f"token-{username}"
+        self._reply({'session-token': token, 'user-id': 1},
+                    [("Set-Cookie", f"session-token={token}; Path=/")])
+
+    def do_GET(self):
+        token = self.headers.get("Cookie", "").partition("=")[2]
+        self._reply({'balance': len(token), 'token': token})
+
+    def log_message(self, *args):
+        pass
+
+
+def test_accounts_share_connections_but_not_sessions():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        pool = ClientPool({'a': ("alice", "x"), 'b': ("bob", "y")},
+                          pool_maxsize=1, max_workers=1, log=False)
+        for client in pool.clients.values():
+            client.session.url = f"http://127.0.0.1:{server.server_port}/"
+        logins = pool.login_all()
+        assert logins['a']['session-token'] == "token-alice"
+        assert pool['b'].session_token == "token-bob"
+        assert pool['a'].session.rate_limiter is not \
+            pool['b'].session.rate_limiter
+
+        balances = pool.get_balances()
+        assert balances['a']['token'] == "token-alice"
+        assert balances['b']['token'] == "token-bob"
+        assert pool.call('a', 'get_balance')['token'] == "token-alice"
+        assert pool.stats() == {'accounts': 2, 'connections': 1,
+                                'requests': 5}
+        pool.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,62 @@
+import time
+
+from matchbook_api import PositionLedger
+
+
+def offer(offer_id, runner_id, side, odds, stake, remaining, status='open',
+          matched=()):
+    return {'id': offer_id, 'market-id': 1, 'runner-id': runner_id,
+            'side': side, 'odds': odds, 'stake': stake,
+            'remaining': remaining, 'status': status,
+            'matched-bets': [{'id': bet_id, 'odds': odds, 'stake': amount}
+                             for bet_id, amount in matched]}
+
+
+def test_incremental_exposure():
+    ledger = PositionLedger()
+    ledger.apply({'offers': [offer(1, 10, 'back', 3.0, 10, 10)]})
+    assert ledger.exposure(1) == 10
+    assert ledger.markets[1].runner_pnl() == {10: 0.0}
+
+    ledger.apply(offer(1, 10, 'back', 3.0, 10, 4, 'partially-matched',
+                       [(100, 6)]))
+    assert ledger.markets[1].runner_pnl() == {10: 12.0}
+    assert ledger.exposure(1) == 10
+
+    ledger.apply({'offers': [offer(2, 20, 'lay', 2.0, 5, 5)]})
+    assert ledger.exposure(1) == 15
+    ledger.apply(offer(1, 10, 'back', 3.0, 10, 4, 'cancelled'))
+    assert ledger.exposure(1) == 11
+    assert ledger.exposure() == 11
+
+
+def test_check():
+    ledger = PositionLedger()
+    ledger.apply(offer(1, 10, 'back', 2.0, 10, 0, 'matched', [(100, 10)]))
+    assert ledger.exposure(1) == 10
+    assert ledger.check(1, 10, 'lay', 2.0, 10, max_exposure=10)
+    assert not ledger.check(1, 20, 'lay', 5.0, 10, max_exposure=40)
+    assert ledger.check(1, 20, 'lay', 5.0, 10, max_exposure=50)
+
+
+class FlakyClient:
+    def __init__(self):
+        self.calls = 0
+
+    def iter_current_bets(self):
+        self.calls += 1
+        if self.calls == 2:
+            raise ConnectionError("connection reset")
+        return iter([])
+
+    def iter_current_offers(self):
+        return iter([])
+
+
+def test_reconcile_thread_survives_errors():
+    client = FlakyClient()
+    ledger = PositionLedger(client)
+    ledger.start(interval=0.01)
+    time.sleep(0.1)
+    ledger.stop()
+    assert client.calls > 2
@@ -0,0 +1,97 @@
+import itertools
+
+import pytest
+
+from matchbook_api import PositionLedger, QuoteManager
+
+
+class FakeClient:
+    def __init__(self, offers):
+        self.offers = offers
+        self.calls = []
+        self.ids = itertools.count(100)
+
+    def iter_offers(self, **kwargs):
+        self.calls.append(('iter_offers', kwargs))
+        return iter(self.offers)
+
+    def cancel_offers_bulk(self, offer_ids, **kwargs):
+        self.calls.append(('cancel', offer_ids))
+        return {'offers': [{'id': offer_id, 'status': 'cancelled'}
+                           for offer_id in offer_ids],
+                'failed': [], 'errors': []}
+
+    def edit_offers_bulk(self, offers, **kwargs):
+        self.calls.append(('edit', offers))
+        return {'offers': [{'market-id': 1, 'runner-id': 7, 'side': 'back',
+                            'status': 'open', 'remaining': offer['stake'],
+                            **offer} for offer in offers],
+                'failed': [], 'errors': []}
+
+    def submit_offers_bulk(self, offers, **kwargs):
+        self.calls.append(('submit', offers))
+        return {'offers': [{'id': next(self.ids), 'market-id': 1,
+                            'status': 'open', 'remaining': offer['stake'],
+                            **offer} for offer in offers],
+                'failed': [], 'errors': []}
+
+
+def offer(offer_id, side, odds, remaining, runner_id=7):
+    return {'id': offer_id, 'market-id': 1, 'runner-id': runner_id,
+            'side': side, 'odds': odds, 'remaining': remaining,
+            'status': 'open'}
+
+
+def test_plan_is_minimal():
+    client = FakeClient([offer(1, 'back', 2.0, 10), offer(2, 'back', 2.2, 5),
+                         offer(3, 'lay', 1.9, 10), offer(4, 'lay', 1.8, 10),
+                         offer(5, 'back', 3.0, 5, runner_id=8)])
+    manager = QuoteManager(client)
+    manager.sync()
+    plan = manager.plan({7: [{'side': 'back', 'odds': 2.0, 'stake': 10},
+                             {'side': 'back', 'odds': 2.2, 'stake': 8},
+                             {'side': 'lay', 'odds': 1.85, 'stake': 10}]})
+    assert plan == {'cancel': [3],
+                    'edit': [{'id': 2, 'odds': 2.2, 'stake': 8},
+                             {'id': 4, 'odds': 1.85, 'stake': 10}],
+                    'submit': []}
+
+
+def test_requote_batches_and_tracks_state():
+    client = FakeClient([offer(1, 'back', 2.0, 10), offer(2, 'lay', 1.9, 5)])
+    ledger = PositionLedger()
+    manager = QuoteManager(client, ledger=ledger)
+    quotes = {7: [{'side': 'back', 'odds': 2.1, 'stake': 10},
+                  {'side': 'back', 'odds': 2.2, 'stake': 10}]}
+    manager.requote(quotes)
+    assert [call[0] for call in client.calls] == ['iter_offers', 'cancel',
+                                                 'edit', 'submit']
+    assert sorted(manager.offers) == [1, 100]
+    assert manager.offers[1]['odds'] == 2.1
+
+    client.calls.clear()
+    plan, results = manager.requote(quotes)
+    assert plan == {'cancel': [], 'edit': [], 'submit': []}
+    assert client.calls == []
+
+    manager.requote({7: []})
+    assert client.calls == [('cancel', [1, 100])]
+    assert manager.offers == {}
+    assert ledger.exposure(1) == 0.0
+
+
+def test_raised_dispatch_marks_state_stale():
+    client = FakeClient([])
+    manager = QuoteManager(client)
+
+    def submit_offers_bulk(offers, **kwargs):
+        raise ConnectionError("connection reset")
+
+    client.submit_offers_bulk = submit_offers_bulk
+    with pytest.raises(ConnectionError):
+        manager.requote({7: [{'side': 'back', 'odds': 2.0, 'stake': 5}]})
+    assert manager.stale
+    client.offers = [offer(1, 'back', 2.0, 5)]
+    plan, _ = manager.requote({7: [{'side': 'back', 'odds': 2.0,
+                                    'stake': 5}]})
+    assert plan['submit'] == []
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from matchbook_api import RateLimiter
+from matchbook_api.ratelimit import classify
+
+
+def test_classify():
+    assert classify("POST", "edge/rest/v2/offers") == 'orders'
+    assert classify("GET", "edge/rest/v2/offers?offset=0") == 'market-data'
+    assert classify("GET", "edge/rest/reports/v2/bets/settled") == 'reports'
+    assert classify("GET", "edge/rest/events?offset=0") == 'market-data'
+
+
+def test_orders_preempt_market_data():
+    limiter = RateLimiter(rates={'global': (20.0, 1.0)})
+    limiter.acquire("GET", "edge/rest/events")
+    order = []
+    polls = [threading.Thread(target=lambda: (
+        limiter.acquire("GET", "edge/rest/events"), order.append('poll')))
+        for _ in range(3)]
+    for thread in polls:
+        thread.start()
+    time.sleep(0.01)
+    limiter.acquire("POST", "edge/rest/v2/offers")
+    order.append('order')
+    for thread in polls:
+        thread.join()
+    assert order[0] == 'order'
+
+
+def test_file_store_shares_budget(tmp_path):
+    path = str(tmp_path / "limits.json")
+    rates = {'global': (0.001, 2.0)}
+    RateLimiter(rates=rates, path=path).acquire("GET", "edge/rest/events")
+    RateLimiter(rates=rates, path=path).acquire("GET", "edge/rest/events")
+    assert not RateLimiter(rates=rates, path=path)._available('market-data')
+
+
+def test_cancelled_waiter_releases_its_place():
+    limiter = RateLimiter(rates={'global': (1.0, 1.0)})
+    limiter.acquire("GET", "edge/rest/events")
+
+    async def cancel_order():
+        task = asyncio.ensure_future(
+            limiter.acquire_async("POST", "edge/rest/v2/offers"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_order())
+    assert limiter._waiters == []
+    start = time.monotonic()
+    limiter.acquire("GET", "edge/rest/events")
+    assert time.monotonic() - start < 2
@@ -0,0 +1,58 @@
+import json
+
+from matchbook_api import (Client, FakeServer, RecordingTransport,
+                           ReplayTransport)
+from matchbook_api.replay import ReplayResponse
+
+
+class CannedTransport:
+    session = None
+
+    def request(self, method, url, **kwargs):
+        if url.endswith("security/session"):
+            data = {'session-token': 'secret-token', 'user-id': 1}
+        else:
+            data = {'events': [{'id': 1}], 'total': 1}
+        return ReplayResponse(200, json.dumps(data).encode(),
+                              {'Content-Type': 'application/json'})
+
+    def close(self):
+        pass
+
+
+def record(path):
+    transport = RecordingTransport(CannedTransport(), path)
+    client = Client("user", "hunter2", log=False, transport=transport)
+    client.login()
+    client.get_events(per_page=5)
+    transport.close()
+
+
+def test_recording_redacts_credentials(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    record(path)
+    with open(path) as f:
+        content = f.read()
+    assert "hunter2" not in content
+    assert "secret-token" not in content
+    assert "REDACTED" in content
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "session.jsonl.gz")
+    record(path)
+    client = Client("user", "pass", log=False,
+                    transport=ReplayTransport(path))
+    assert client.login()['session-token'] == "REDACTED"
+    assert client.get_events(per_page=5)['events'] == [{'id': 1}]
+    assert isinstance(client.get_events(per_page=6), Exception)
+
+
+def test_fake_server(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    record(path)
+    with FakeServer(path) as server:
+        client = Client("user", "pass", log=False)
+        client.session.url = server.url
+        assert client.login()['user-id'] == 1
+        assert client.get_events(per_page=5)['total'] == 1
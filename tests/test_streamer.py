@@ -0,0 +1,51 @@
+from matchbook_api import MarketStreamer
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+        self.odds = 2.0
+
+    def get_events(self, **kwargs):
+        self.calls.append(kwargs)
+        prices = [{'side': 'back', 'odds': self.odds, 'available-amount': 10}]
+        return {'events': [{'id': 1, 'markets': [
+            {'id': 11, 'runners': [{'id': 111, 'prices': prices}]},
+            {'id': 12, 'runners': [{'id': 121, 'prices': prices}]},
+        ]}]}
+
+
+def test_poll_emits_only_changes():
+    client = FakeClient()
+    seen = []
+    streamer = MarketStreamer(client, lambda *args: seen.append(args[0]))
+    streamer.watch(1, 11)
+    assert list(streamer.poll()) == [11]
+    assert client.calls[0]['ids'] == "1"
+    assert streamer.poll() == {}
+    client.odds = 2.5
+    assert list(streamer.poll()[11]) == [111]
+    assert seen == [11, 11]
+
+
+def test_poll_survives_errors_and_unwatch():
+    client = FakeClient()
+    streamer = MarketStreamer(client)
+    streamer.watch(1, 11)
+    streamer.watch(1, 12)
+    get_events = client.get_events
+
+    def failing(**kwargs):
+        raise ConnectionError("connection reset")
+
+    client.get_events = failing
+    assert streamer.poll() == {}
+    assert streamer.interval == streamer.max_interval
+
+    def unwatch_during_poll(**kwargs):
+        data = get_events(**kwargs)
+        streamer.unwatch(1, 12)
+        return data
+
+    client.get_events = unwatch_during_poll
+    assert list(streamer.poll()) == [11]
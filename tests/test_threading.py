@@ -0,0 +1,46 @@
+import threading
+
+from matchbook_api import Client
+
+
+def runner_http(fake_http, fake_response, delay=0.0):
+    def respond(method, url, headers):
+        if url.endswith("security/session"):
+            token = str(len(http.requests))
+            return fake_response(200, {'session-token': token, 'user-id': 1})
+        runner_id = int(url.split("?")[0].rsplit("/", 1)[1])
+        return fake_response(200, {'id': runner_id})
+
+    http = fake_http(respond, delay=delay)
+    return http
+
+
+def test_map_and_request_context(fake_http, fake_response):
+    client = Client(log=False)
+    client.session.transport = runner_http(fake_http, fake_response)
+    with client.request_context(**{'X-Request-Id': 'abc'}):
+        runners = client.map(client.get_runner,
+                             [(1, 2, runner_id) for runner_id in range(20)],
+                             max_workers=8)
+    assert [runner['id'] for runner in runners] == list(range(20))
+    assert all(headers['X-Request-Id'] == 'abc'
+               for _, _, headers in client.session.transport.requests)
+
+
+def test_concurrent_logins_share_one_request(fake_http, fake_response):
+    client = Client(log=False)
+    client.session.transport = runner_http(fake_http, fake_response,
+                                           delay=0.05)
+    barrier = threading.Barrier(8)
+
+    def login():
+        barrier.wait()
+        client.login()
+
+    threads = [threading.Thread(target=login) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(client.session.transport.requests) == 1
+    assert client.session_token == '1'
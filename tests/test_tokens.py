@@ -0,0 +1,64 @@
+import json
+import os
+import stat
+import subprocess
+import sys
+
+from matchbook_api import Client, FakeServer, TokenCache
+from matchbook_api.__main__ import main
+
+
+def write_records(path):
+    records = [
+        ("POST", "bpapi/rest/security/session",
+         {'session-token': 't1', 'user-id': 7}),
+        ("GET", "edge/rest/account/balance", {'balance': 100}),
+    ]
+    with open(path, "w") as f:
+        for method, url, response in records:
+            f.write(json.dumps({'t': 0, 'method': method, 'url': url,
+                                'body': None, 'status': 200,
+                                'headers': {}, 'response':
+                                json.dumps(response)}) + "\n")
+
+
+def test_token_cache_is_private_and_expires(tmp_path):
+    path = str(tmp_path / "tokens" / "tokens.json")
+    cache = TokenCache(path)
+    cache.save("alice", "t1", 7)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert cache.load("alice")['session-token'] == "t1"
+    assert TokenCache(path, max_age=-1).load("alice") is None
+    cache.discard("alice")
+    assert cache.load("alice") is None
+
+
+def test_client_reuses_cached_token(tmp_path):
+    cache = TokenCache(str(tmp_path / "tokens.json"))
+    cache.save("alice", "t1", 7)
+    client = Client("alice", "pw", log=False, token_cache=cache)
+    assert client.session._transport is None
+    assert client.login()['session-token'] == "t1"
+    assert client.session_token == "t1"
+    assert client.session.session.cookies['session-token'] == "t1"
+
+
+def test_cli_logs_in_once(tmp_path, capsys):
+    records = str(tmp_path / "records.jsonl")
+    write_records(records)
+    argv = ["--username", "alice", "--password", "pw", "--token-cache",
+            str(tmp_path / "tokens.json")]
+    with FakeServer(records) as server:
+        assert main(argv + ["--url", server.url, "balance"]) == 0
+        assert json.loads(capsys.readouterr().out) == {'balance': 100}
+        assert main(argv + ["--url", server.url, "balance"]) == 0
+        assert server.transport.requests == 3
+        assert main(argv + ["--url", server.url, "account"]) == 1
+    assert "404" in capsys.readouterr().err
+
+
+def test_client_import_skips_requests():
+    code = ("import sys; from matchbook_api import Client; "
+            "Client(log=False); "
+            "assert 'requests' not in sys.modules, 'requests imported'")
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,50 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from matchbook_api import Client, HTTPXTransport, RequestsTransport
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"balance": 100}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def check_reuse(server, transport):
+    client = Client(log=False, transport=transport)
+    client.session.url = server
+    for _ in range(3):
+        assert client.get_balance() == {'balance': 100}
+    assert transport.stats() == {'connections': 1, 'requests': 3,
+                                 'reused': 2}
+
+
+def test_connections_are_reused(server):
+    check_reuse(server, RequestsTransport(pool_maxsize=2, timeout=(1, 1)))
+
+
+def test_httpx_connections_are_reused(server):
+    pytest.importorskip("httpx")
+    check_reuse(server, HTTPXTransport(pool_maxsize=2, timeout=(1, 1),
+                                       http2=False))
@@ -0,0 +1,38 @@
+import gzip
+
+from matchbook_api.endpoints import RequestTemplate, _encode_cached
+from matchbook_api.utils import add_kwargs_to_url, decode_body
+
+
+def test_decode_body():
+    body = b'{"events": [{"id": 1}]}'
+    assert decode_body(body) == {'events': [{'id': 1}]}
+    assert decode_body(gzip.compress(body)) == {'events': [{'id': 1}]}
+    assert decode_body(gzip.compress(body), raw=True) == body
+
+
+def test_add_kwargs_to_url():
+    url = add_kwargs_to_url("edge/rest/events?", per_page=20,
+                            include_prices=True)
+    assert url == "edge/rest/events?per-page=20&include-prices=true"
+
+
+def test_request_template_matches_add_kwargs_to_url():
+    def get_markets(self, event_id: int, offset: int = 0,
+                    include_prices: bool = False, **kwargs):
+        pass
+
+    template = RequestTemplate.for_method("edge/rest/events/{event_id}/"
+                                          "markets", get_markets)
+    params = {'self': None, 'event_id': 7, 'offset': 40,
+              'include_prices': False, 'kwargs': {'states': "open,closed"}}
+    assert template.url(params) == add_kwargs_to_url(
+        "edge/rest/events/7/markets?", offset=40, include_prices=False,
+        states="open,closed")
+
+
+def test_encode_cache_keeps_bools_and_ints_apart():
+    assert _encode_cached('x', 1) == "x=1"
+    assert _encode_cached('x', True) == "x=true"
+    assert _encode_cached('x', 2.0) == "x=2.0"
+    assert _encode_cached('x', 2) == "x=2"